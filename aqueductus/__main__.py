@@ -1,10 +1,16 @@
+import json
+import logging
 import sys
 from pathlib import Path
+from typing import Any
 
 import click
 
-from aqueductus.reporters import ReporterFactory
-from aqueductus.runner import TestRunner
+from aqueductus.daemon import Daemon
+from aqueductus.reporters import JsonReporter, ReporterFactory
+from aqueductus.runner import Test, TestRunner, run_parallel
+from aqueductus.scheduling import check_shards, format_plan, parse_shard
+from aqueductus.state import DurationHistory
 from aqueductus.utils import load_module
 
 # Register classes into their factories
@@ -13,17 +19,18 @@ for module in ["providers.py", "reporters.py", "testers.py"]:
     load_module(module)
 
 
-@click.command()
-@click.argument("config_files", nargs=-1, required=True, type=click.Path())
-@click.option(
-    "--format",
-    "-f",
-    multiple=True,
-    default=["console"],
-    type=click.Choice(ReporterFactory.list_available_reporters()),
-    help="Output format",
-)
-def main(config_files: tuple[str], format: tuple[str]) -> None:
+class DefaultCommandGroup(click.Group):
+    """Group that falls back to the `run` command, so `aqueductus config.yml` works."""
+
+    default_command = "run"
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if args and args[0] not in self.commands and args[0] != "--help":
+            args.insert(0, self.default_command)
+        return super().parse_args(ctx, args)
+
+
+def _expand_config_files(config_files: tuple[str, ...]) -> list[str]:
     # Expand glob patterns into a list of file paths
     all_files: set[Path] = set()
     for config_file in config_files:
@@ -39,11 +46,30 @@ def main(config_files: tuple[str], format: tuple[str]) -> None:
             if not path.exists():
                 raise click.BadParameter(f"Config file does not exist: {config_file}")
             all_files.add(path)
+    # Sorted, so every process loads the tests in the same order
+    return [str(file) for file in sorted(all_files)]
+
 
-    tester = TestRunner([str(file) for file in all_files])
-    tests = tester.run_all()
+def _parse_shard_option(
+    ctx: click.Context, param: click.Parameter, value: str | None
+) -> tuple[int, int] | None:
+    if value is None:
+        return None
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+def _report_and_exit(
+    tests: list[Test],
+    format: tuple[str, ...],
+    shard_manifest: dict[str, Any] | None = None,
+) -> None:
     for fmt in format:
         reporter = ReporterFactory.create_reporter(fmt)
+        if isinstance(reporter, JsonReporter):
+            reporter.shard = shard_manifest
         reporter.generate_report(tests)
 
     for test in tests:
@@ -53,5 +79,160 @@ def main(config_files: tuple[str], format: tuple[str]) -> None:
     sys.exit(0)
 
 
+format_option = click.option(
+    "--format",
+    "-f",
+    multiple=True,
+    default=["console"],
+    type=click.Choice(ReporterFactory.list_available_reporters()),
+    help="Output format",
+)
+
+
+@click.group(cls=DefaultCommandGroup)
+def main() -> None:
+    pass
+
+
+@main.command()
+@click.argument("config_files", nargs=-1, required=True, type=click.Path())
+@format_option
+@click.option(
+    "--shard",
+    callback=_parse_shard_option,
+    help="Only run shard i of N (e.g. 2/4), balanced by recorded test durations",
+)
+@click.option(
+    "--workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of local processes to split the tests across",
+)
+@click.option(
+    "--history",
+    type=click.Path(dir_okay=False),
+    help="Test duration history file used to balance shards and workers",
+)
+@click.option(
+    "--batch-size",
+    default=0,
+    type=click.IntRange(min=0),
+    help="Combine up to this many aggregate-only tests per provider into one query",
+)
+@click.option(
+    "--plan",
+    is_flag=True,
+    help="Print the estimated schedule and critical path without running the tests",
+)
+def run(
+    config_files: tuple[str, ...],
+    format: tuple[str, ...],
+    shard: tuple[int, int] | None,
+    workers: int,
+    history: str | None,
+    batch_size: int,
+    plan: bool,
+) -> None:
+    files = _expand_config_files(config_files)
+    tester = TestRunner(files, shard=shard, history_path=history, batch_size=batch_size)
+    if plan:
+        try:
+            buckets = tester.plan(workers)
+        finally:
+            tester.close()
+        click.echo(
+            format_plan(
+                [
+                    [
+                        (tester.tests[i].name, seconds, source)
+                        for i, seconds, source in b
+                    ]
+                    for b in buckets
+                ]
+            )
+        )
+        sys.exit(0)
+    # Shard durations are recorded when their reports are merged
+    record_history = shard is None
+    if workers > 1:
+        tests = run_parallel(
+            tester,
+            workers,
+            history_path=history,
+            batch_size=batch_size,
+            record_history=record_history,
+        )
+    else:
+        tests = tester.run_all(record_history=record_history)
+    _report_and_exit(tests, format, tester.shard_manifest)
+
+
+@main.command()
+@click.argument("report_files", nargs=-1, required=True, type=click.Path(exists=True))
+@format_option
+@click.option(
+    "--history",
+    type=click.Path(dir_okay=False),
+    help="Test duration history file to record the durations of every shard into",
+)
+def merge(
+    report_files: tuple[str, ...], format: tuple[str, ...], history: str | None
+) -> None:
+    """Merge the JSON reports of several shards into the final reports."""
+    tests = []
+    manifests = []
+    for report_file in report_files:
+        with open(report_file, "r") as f:
+            report = json.load(f)
+        manifest = None
+        durations: dict[str, float] = {}
+        results_by_test: dict[str, Any] = {}
+        for entry in report:
+            if isinstance(entry.get("shard"), dict):
+                manifest = entry["shard"]
+            elif isinstance(entry.get("durations"), dict):
+                durations = entry["durations"]
+            else:
+                results_by_test.update(entry)
+        for name, results in results_by_test.items():
+            tests.append(Test.from_results(name, "", results, durations.get(name, 0.0)))
+        manifests.append(manifest)
+
+    problems = check_shards(manifests, [test.name for test in tests])
+    if problems:
+        raise click.ClickException(
+            "Can't merge the reports:\n" + "\n".join(f"  - {p}" for p in problems)
+        )
+    # Shards don't save their durations, the merged history is the one to reuse
+    duration_history = DurationHistory(history)
+    for test in tests:
+        duration_history.record(test.name, test.duration)
+    duration_history.save()
+    _report_and_exit(tests, format)
+
+
+@main.command()
+@click.argument("config_files", nargs=-1, required=True, type=click.Path())
+@click.option(
+    "--interval",
+    default=300.0,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds between runs for tests without their own 'interval'",
+)
+@click.option(
+    "--metrics-file",
+    default="metrics.prom",
+    type=click.Path(dir_okay=False),
+    help="File to write Prometheus text-format metrics to",
+)
+def daemon(config_files: tuple[str, ...], interval: float, metrics_file: str) -> None:
+    """Keep running the tests on their intervals, reloading configs on change."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s"
+    )
+    files = _expand_config_files(config_files)
+    Daemon(files, default_interval=interval, metrics_path=metrics_file).serve_forever()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,136 @@
+import heapq
+import logging
+import os
+import time
+
+from aqueductus.reporters import PrometheusReporter
+from aqueductus.runner import Test, TestRunner
+
+logger = logging.getLogger(__name__)
+
+
+class Daemon:
+    """
+    Keeps providers and parsed tests warm and runs every test on its own interval.
+
+    Tests are kept in a priority queue ordered by their next due time (and by their
+    `priority` when several are due at once). Config files are polled for changes and
+    reloaded in place. After each run, metrics for every test are written to
+    `metrics_path` in the Prometheus text format.
+    """
+
+    def __init__(
+        self,
+        config_files: list[str],
+        default_interval: float,
+        metrics_path: str,
+        poll_interval: float = 5.0,
+    ):
+        self.config_files = config_files
+        self.default_interval = default_interval
+        self.poll_interval = poll_interval
+        self.reporter = PrometheusReporter(metrics_path)
+        self.runner: TestRunner | None = None
+        self._queue: list[tuple[float, int, int, Test]] = []
+        self._mtimes = self._read_mtimes()
+        self._load()
+
+    def _watched_files(self) -> list[str]:
+        # Placeholders are read from environment.py, so it is part of the config
+        return [*self.config_files, "environment.py"]
+
+    def _read_mtimes(self) -> dict[str, float | None]:
+        return {
+            path: os.path.getmtime(path) if os.path.exists(path) else None
+            for path in self._watched_files()
+        }
+
+    def _load(self) -> None:
+        runner = TestRunner(self.config_files)
+        if self.runner is not None:
+            self.runner.close()
+        self.runner = runner
+
+        now = time.time()
+        self._queue = [
+            (now, -test.priority, position, test)
+            for position, test in enumerate(runner.tests)
+        ]
+        heapq.heapify(self._queue)
+        logger.info("Loaded %d tests", len(runner.tests))
+
+    def _reload_if_changed(self) -> None:
+        mtimes = self._read_mtimes()
+        if mtimes == self._mtimes:
+            return
+        self._mtimes = mtimes
+        logger.info("Config files changed, reloading")
+        try:
+            self._load()
+        except Exception:
+            # Keep running the previous config until the files are fixed
+            logger.exception("Failed to reload config files")
+
+    def _run_test(self, test: Test) -> None:
+        assert self.runner is not None
+        try:
+            try:
+                test.run()
+            except Exception:
+                # Warm connections can be dropped by the server (restarts, idle
+                # timeouts), reconnect the test's broken providers and retry once
+                reconnected = self.runner.reconnect_providers(test)
+                if not reconnected:
+                    raise
+                logger.warning(
+                    "Reconnected providers %s, retrying test '%s'",
+                    ", ".join(reconnected),
+                    test.name,
+                )
+                test.run()
+        except Exception as e:
+            test.runs += 1
+            test.failures += 1
+            test.results = [
+                {
+                    "name": "error",
+                    "passed": False,
+                    "message": str(e),
+                    "details": {},
+                    "time": 0.0,
+                }
+            ]
+            logger.exception("Test '%s' failed to run", test.name)
+        else:
+            logger.info(
+                "Test '%s' %s in %.3fs",
+                test.name,
+                "passed" if test.passed else "failed",
+                test.duration,
+            )
+
+    def run_pending(self) -> float:
+        """Run every due test and return the seconds until the next one is due."""
+        assert self.runner is not None
+        while self._queue and self._queue[0][0] <= time.time():
+            _, priority, position, test = heapq.heappop(self._queue)
+            self._run_test(test)
+            self.runner.fingerprints.save()
+            self.reporter.generate_report(self.runner.tests)
+            interval = test.interval or self.default_interval
+            heapq.heappush(
+                self._queue, (time.time() + interval, priority, position, test)
+            )
+        if not self._queue:
+            return self.poll_interval
+        return max(self._queue[0][0] - time.time(), 0.0)
+
+    def serve_forever(self) -> None:
+        try:
+            while True:
+                wait = self.run_pending()
+                time.sleep(min(wait, self.poll_interval))
+                self._reload_if_changed()
+        finally:
+            if self.runner is not None:
+                self.runner.close()
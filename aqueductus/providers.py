@@ -1,7 +1,12 @@
+import hashlib
 import inspect
+import json
 import sqlite3
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any, ClassVar, Sequence, Type
+from typing import Any, ClassVar, Iterator, Sequence, Type
+
+from aqueductus.utils import as_subquery
 
 try:
     import pyathena
@@ -18,6 +23,9 @@ try:
 except ImportError:
     pymysql = None
 
+# Rows fetched per round-trip when streaming query results
+STREAM_BATCH_SIZE = 10_000
+
 
 class ProviderFactory:
     _providers: dict[str, Type["Provider"]] = {}
@@ -48,6 +56,8 @@ class ProviderFactory:
 class Provider(ABC):
     # Class variable to store provider metadata
     provider_name: ClassVar[str]
+    # Default query timeout in seconds for the tests using this provider
+    timeout: float | None = None
 
     @classmethod
     def __init_subclass__(cls, **kwargs):
@@ -88,6 +98,57 @@ class Provider(ABC):
     def execute_query(self, query: str) -> Sequence[dict[str, Any]]:
         pass
 
+    def stream_query(self, query: str) -> Iterator[dict[str, Any]]:
+        """
+        Yield the query rows without holding the whole result in memory.
+
+        Providers should override it with their driver's server-side or batched
+        cursors; the default implementation fetches all the rows at once.
+        """
+        yield from self.execute_query(query)
+
+    def fingerprint(self, query: str) -> str | None:
+        """
+        Return a cheap digest of the query results, computed on the server.
+
+        The digest is made of the row count and an order-independent hash aggregate
+        of the rows. Providers that can't compute it return None.
+        """
+        return None
+
+    def estimate_cost(self, query: str) -> float | None:
+        """
+        Return the planner cost of the query without running it, e.g. from EXPLAIN.
+
+        Costs are in the database's own units, they are only compared with other
+        queries of the same provider. Providers without estimates return None.
+        """
+        return None
+
+    def cancel(self) -> None:
+        """
+        Cancel the query currently running on the server.
+
+        Called from a different thread than the one executing the query, which
+        should then fail with the driver's error.
+        """
+        raise NotImplementedError(
+            f"Provider '{self.provider_name}' does not support query cancellation"
+        )
+
+    def is_connected(self) -> bool:
+        """Whether the connection can still run queries, checked after failures."""
+        try:
+            self.execute_query("SELECT 1")
+        except Exception:
+            return False
+        return True
+
+    def close(self) -> None:
+        conn = getattr(self, "conn", None)
+        if conn is not None:
+            conn.close()
+
 
 class AthenaProvider(Provider):
     provider_name = "athena"
@@ -104,6 +165,8 @@ class AthenaProvider(Provider):
             ).cursor()
         except Exception as e:
             raise self._format_connection_error("Athena", e) from e
+        # A cursor holds a single result set, so each stream gets its own cursor
+        self._stream_cursors: set[Any] = set()
 
     def execute_query(self, query: str) -> Sequence[dict[str, Any]]:
         try:
@@ -113,6 +176,44 @@ class AthenaProvider(Provider):
         except Exception as e:
             raise self._format_query_error("Athena", query, e) from e
 
+    def stream_query(self, query: str) -> Iterator[dict[str, Any]]:
+        cursor = self.conn.connection.cursor()
+        self._stream_cursors.add(cursor)
+        try:
+            cursor.execute(query)
+            columns = [col[0] for col in cursor.description]
+            while rows := cursor.fetchmany(STREAM_BATCH_SIZE):
+                for row in rows:
+                    yield dict(zip(columns, row))
+        except Exception as e:
+            raise self._format_query_error("Athena", query, e) from e
+        finally:
+            self._stream_cursors.discard(cursor)
+            cursor.close()
+
+    def _query_columns(self, query: str) -> list[str]:
+        self.conn.execute(f"SELECT * FROM {as_subquery(query)} AS t LIMIT 0")
+        return [col[0] for col in self.conn.description]  # type: ignore[union-attr]
+
+    def fingerprint(self, query: str) -> str | None:
+        try:
+            columns = ", ".join(f'"{c}"' for c in self._query_columns(query))
+            # checksum() is an order-insensitive aggregate
+            self.conn.execute(
+                f"SELECT COUNT(*), checksum(ROW({columns})) "
+                f"FROM {as_subquery(query)} AS t"
+            )
+            row_count, row_hash = self.conn.fetchone()  # type: ignore[misc]
+        except Exception as e:
+            raise self._format_query_error("Athena", query, e) from e
+        return f"{row_count}:{row_hash}"
+
+    def cancel(self) -> None:
+        # Stops the query executions in Athena, including the ones being streamed
+        for cursor in [self.conn, *list(self._stream_cursors)]:
+            if cursor.query_id:
+                cursor.cancel()
+
 
 class MySQLProvider(Provider):
     provider_name = "mysql"
@@ -120,17 +221,23 @@ class MySQLProvider(Provider):
     def __init__(self, config: dict[str, Any]):
         if pymysql is None:
             raise self._format_import_error("pymysql", "mysql")
+        self.config = config
         try:
-            self.conn = pymysql.connect(
-                host=config["host"],
-                user=config["user"],
-                password=config["password"],
-                port=config["port"],
-                database=config["database"],
-                cursorclass=pymysql.cursors.DictCursor,
-            )
+            self.conn = self._connect()
         except Exception as e:
             raise self._format_connection_error("MySQL", e) from e
+        # Connections of the streams being read, see `stream_query`
+        self._stream_conns: set[Any] = set()
+
+    def _connect(self) -> Any:
+        return pymysql.connect(
+            host=self.config["host"],
+            user=self.config["user"],
+            password=self.config["password"],
+            port=self.config["port"],
+            database=self.config["database"],
+            cursorclass=pymysql.cursors.DictCursor,
+        )
 
     def execute_query(self, query: str) -> Sequence[dict[str, Any]]:
         try:
@@ -140,6 +247,75 @@ class MySQLProvider(Provider):
         except Exception as e:
             raise self._format_query_error("MySQL", query, e) from e
 
+    def stream_query(self, query: str) -> Iterator[dict[str, Any]]:
+        # An unbuffered result blocks its connection until it is fully read, so each
+        # stream uses its own connection and several streams can be read at once
+        try:
+            conn = self._connect()
+        except Exception as e:
+            raise self._format_connection_error("MySQL", e) from e
+        self._stream_conns.add(conn)
+        try:
+            # Unbuffered cursor, rows are read from the server as they are consumed
+            with conn.cursor(pymysql.cursors.SSDictCursor) as cursor:
+                cursor.execute(query)
+                while rows := cursor.fetchmany(STREAM_BATCH_SIZE):
+                    yield from rows
+        except Exception as e:
+            raise self._format_query_error("MySQL", query, e) from e
+        finally:
+            self._stream_conns.discard(conn)
+            conn.close()
+
+    def _query_columns(self, query: str) -> list[str]:
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"SELECT * FROM {as_subquery(query)} AS t LIMIT 0")
+            return [col[0] for col in cursor.description]
+
+    def fingerprint(self, query: str) -> str | None:
+        try:
+            columns = ", ".join(f"QUOTE(`{c}`)" for c in self._query_columns(query))
+            # Sum of the first 60 bits of each row's MD5, independent of row order
+            row_hash = f"CONV(SUBSTRING(MD5(CONCAT_WS(',', {columns})), 1, 15), 16, 10)"
+            with self.conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COUNT(*) AS row_count, "
+                    f"COALESCE(SUM(CAST({row_hash} AS UNSIGNED)), 0) AS row_hash "
+                    f"FROM {as_subquery(query)} AS t"
+                )
+                row = cursor.fetchone()
+        except Exception as e:
+            raise self._format_query_error("MySQL", query, e) from e
+        if row is None:
+            return None
+        return f"{row['row_count']}:{row['row_hash']}"
+
+    def estimate_cost(self, query: str) -> float | None:
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute(f"EXPLAIN FORMAT=JSON {query.strip().rstrip(';')}")
+                row = cursor.fetchone()
+        except Exception as e:
+            raise self._format_query_error("MySQL", query, e) from e
+        try:
+            plan = json.loads(next(iter(row.values())))
+            cost = plan["query_block"]["cost_info"]["query_cost"]
+            return float(cost)
+        except (AttributeError, LookupError, StopIteration, TypeError, ValueError):
+            # No row or an unexpected plan format, e.g. from another MySQL version
+            return None
+
+    def cancel(self) -> None:
+        # The busy connections can't be used, kill their queries from a new one
+        thread_ids = [c.thread_id() for c in [self.conn, *list(self._stream_conns)]]
+        conn = self._connect()
+        try:
+            with conn.cursor() as cursor:
+                for thread_id in thread_ids:
+                    cursor.execute(f"KILL QUERY {int(thread_id)}")
+        finally:
+            conn.close()
+
 
 class SQLiteProvider(Provider):
     provider_name = "sqlite"
@@ -155,11 +331,61 @@ class SQLiteProvider(Provider):
         try:
             cursor = self.conn.cursor()
             cursor.execute(query)
-            return cursor.fetchall()
+            return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            raise self._format_query_error("SQLite", query, e) from e
+        finally:
+            cursor.close()
+
+    def stream_query(self, query: str) -> Iterator[dict[str, Any]]:
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query)
+            while rows := cursor.fetchmany(STREAM_BATCH_SIZE):
+                for row in rows:
+                    yield dict(row)
+        except Exception as e:
+            raise self._format_query_error("SQLite", query, e) from e
+        finally:
+            cursor.close()
+
+    def fingerprint(self, query: str) -> str | None:
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT * FROM {as_subquery(query)} AS t LIMIT 0")
+            columns = ", ".join(f'"{col[0]}"' for col in cursor.description)
+            # SQLite has no hash functions, use a Python aggregate instead
+            self.conn.create_aggregate(
+                "aqueductus_row_hash", -1, _SQLiteRowHash  # type: ignore[arg-type]
+            )
+            cursor.execute(
+                f"SELECT COUNT(*), aqueductus_row_hash({columns}) "
+                f"FROM {as_subquery(query)} AS t"
+            )
+            row_count, row_hash = cursor.fetchone()
         except Exception as e:
             raise self._format_query_error("SQLite", query, e) from e
         finally:
             cursor.close()
+        return f"{row_count}:{row_hash}"
+
+    def cancel(self) -> None:
+        self.conn.interrupt()
+
+
+class _SQLiteRowHash:
+    """Order-independent sum of the row hashes, modulo 2^64."""
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def step(self, *values: Any) -> None:
+        digest = hashlib.blake2b(repr(values).encode(), digest_size=8).digest()
+        self.total = (self.total + int.from_bytes(digest, "big")) % 2**64
+
+    def finalize(self) -> str:
+        # Returned as text, SQLite integers are signed 64 bits
+        return str(self.total)
 
 
 class PostgreSQLProvider(Provider):
@@ -187,4 +413,57 @@ class PostgreSQLProvider(Provider):
                 cursor.execute(query)
                 return cursor.fetchall()
         except Exception as e:
+            # Leave the aborted transaction so the connection can be reused
+            self.conn.rollback()
+            raise self._format_query_error("PostgreSQL", query, e) from e
+
+    def stream_query(self, query: str) -> Iterator[dict[str, Any]]:
+        try:
+            # Named cursors are server-side, rows are fetched in batches of itersize
+            with self.conn.cursor(
+                name=f"aqueductus_{uuid.uuid4().hex}",
+                cursor_factory=psycopg2.extras.RealDictCursor,
+            ) as cursor:
+                cursor.itersize = STREAM_BATCH_SIZE
+                cursor.execute(query)
+                yield from cursor
+        except Exception as e:
+            self.conn.rollback()
             raise self._format_query_error("PostgreSQL", query, e) from e
+
+    def fingerprint(self, query: str) -> str | None:
+        # Each row is hashed from its text representation, so no columns are needed.
+        # The sum of the first 60 bits of the MD5s doesn't depend on the row order.
+        row_hash = "('x' || SUBSTR(MD5(CAST(t AS TEXT)), 1, 15))::BIT(60)::BIGINT"
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COUNT(*), COALESCE(SUM({row_hash}), 0) "
+                    f"FROM {as_subquery(query)} AS t"
+                )
+                row = cursor.fetchone()
+        except Exception as e:
+            self.conn.rollback()
+            raise self._format_query_error("PostgreSQL", query, e) from e
+        if row is None:
+            return None
+        row_count, row_hash_sum = row
+        return f"{row_count}:{row_hash_sum}"
+
+    def estimate_cost(self, query: str) -> float | None:
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {query.strip().rstrip(';')}")
+                row = cursor.fetchone()
+        except Exception as e:
+            self.conn.rollback()
+            raise self._format_query_error("PostgreSQL", query, e) from e
+        if row is None:
+            return None
+        try:
+            return float(row[0][0]["Plan"]["Total Cost"])
+        except (LookupError, TypeError, ValueError):
+            return None
+
+    def cancel(self) -> None:
+        self.conn.cancel()
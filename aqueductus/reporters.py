@@ -1,8 +1,9 @@
 import inspect
 import json
+import os
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
-from typing import ClassVar, Type
+from typing import Any, ClassVar, Type
 
 from aqueductus.runner import Test
 
@@ -70,9 +71,20 @@ class ConsoleReporter(Reporter):
 class JsonReporter(Reporter):
     reporter_name = "json"
 
+    def __init__(self, shard: dict[str, Any] | None = None):
+        # Manifest of the shard that produced the results, checked by `merge`
+        self.shard = shard
+
     def generate_report(self, tests: list[Test]) -> None:
+        report: list[dict[str, Any]] = [
+            {test.name: test.results for test in tests},
+            # Recorded into the duration history when the shard reports are merged
+            {"durations": {test.name: test.duration for test in tests}},
+        ]
+        if self.shard is not None:
+            report.append({"shard": self.shard})
         with open("report.json", "w+") as f:
-            json.dump([{test.name: test.results for test in tests}], f, indent=2)
+            json.dump(report, f, indent=2)
 
 
 class JUnitReporter(Reporter):
@@ -107,7 +119,9 @@ class MarkdownReporter(Reporter):
         report = "# Test Results\n\n"
         for test in tests:
             report += f"## {test.name}\n"
-            report += f"**Query**: `{test.query}`\n\n"
+            # Tests merged from shard reports don't carry their query
+            if test.query:
+                report += f"**Query**: `{test.query}`\n\n"
             for result in test.results:
                 status = "✅ PASSED" if result["passed"] else "❌ FAILED"
                 report += f"- **{result["name"]}**: {status}\n"
@@ -116,3 +130,60 @@ class MarkdownReporter(Reporter):
             report += "\n"
         with open("report.md", "w+") as f:
             f.write(report)
+
+
+class PrometheusReporter(Reporter):
+    reporter_name = "prometheus"
+
+    _METRICS = [
+        ("test_duration_seconds", "gauge", "Duration of the last run of the test."),
+        ("test_rows_scanned", "gauge", "Rows returned by the test query."),
+        ("test_passed", "gauge", "Whether all checks of the last run passed."),
+        ("test_last_run_timestamp_seconds", "gauge", "Time of the last run."),
+        ("test_runs_total", "counter", "Runs of the test."),
+        ("test_failures_total", "counter", "Failed runs of the test."),
+        ("check_passed", "gauge", "Whether the check passed in the last run."),
+        ("check_duration_seconds", "gauge", "Duration of the check in the last run."),
+    ]
+
+    def __init__(self, path: str = "metrics.prom"):
+        self.path = path
+
+    @staticmethod
+    def _labels(**labels: str) -> str:
+        pairs = []
+        for key, value in labels.items():
+            value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs.append(f'{key}="{value}"')
+        return "{" + ",".join(pairs) + "}"
+
+    def generate_report(self, tests: list[Test]) -> None:
+        samples: dict[str, list[str]] = {name: [] for name, _, _ in self._METRICS}
+        for test in tests:
+            if not test.runs:
+                continue
+            labels = self._labels(test=test.name)
+            samples["test_duration_seconds"].append(f"{labels} {test.duration}")
+            samples["test_rows_scanned"].append(f"{labels} {test.rows_scanned}")
+            samples["test_passed"].append(f"{labels} {int(test.passed)}")
+            samples["test_last_run_timestamp_seconds"].append(
+                f"{labels} {test.last_run}"
+            )
+            samples["test_runs_total"].append(f"{labels} {test.runs}")
+            samples["test_failures_total"].append(f"{labels} {test.failures}")
+            for result in test.results:
+                labels = self._labels(test=test.name, check=result["name"])
+                samples["check_passed"].append(f"{labels} {int(result['passed'])}")
+                samples["check_duration_seconds"].append(f"{labels} {result['time']}")
+
+        lines = []
+        for name, metric_type, help_text in self._METRICS:
+            lines.append(f"# HELP aqueductus_{name} {help_text}")
+            lines.append(f"# TYPE aqueductus_{name} {metric_type}")
+            lines.extend(f"aqueductus_{name}{sample}" for sample in samples[name])
+
+        # Write atomically so scrapers never read a partial file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w+") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.path)
@@ -1,13 +1,26 @@
+import itertools
 import os
 import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from re import Match
-from typing import Any, TypedDict
+from typing import Any, Iterator, Sequence, TypedDict, cast
 
 import yaml
 
 from aqueductus.providers import Provider, ProviderFactory
+from aqueductus.scheduling import (
+    estimate_durations,
+    fill_missing_durations,
+    partition,
+    shard_manifest,
+)
+from aqueductus.state import DurationHistory, FingerprintStore
 from aqueductus.testers import TestFactory, TestResult
-from aqueductus.utils import load_module
+from aqueductus.utils import as_subquery, load_module, sql_literal
 
 
 class Test:
@@ -18,21 +31,298 @@ class Test:
         query: str,
         test_configs: dict[str, Any],
         providers: dict[str, Provider],
+        interval: float | None = None,
+        priority: int = 0,
+        timeout: float | None = None,
+        fingerprints: FingerprintStore | None = None,
+        parameter_group: "ParameterGroup | None" = None,
+        parameter_index: int = 0,
     ):
         self.name = name
         self.provider = provider
         self.query = query
         self.test_configs = test_configs
         self.providers = providers
+        # Overrides the provider timeout when set
+        self.timeout = timeout
+        # Skips fetching unchanged results when set
+        self.fingerprints = fingerprints
+        # Parameterized sub-tests get their rows from the group's shared query
+        self.parameter_group = parameter_group
+        self.parameter_index = parameter_index
+        # Scheduling settings, only used by the daemon
+        self.interval = interval
+        self.priority = priority
         self.results: list[TestResult] = []
+        self.duration = 0.0
+        self.last_run = 0.0
+        self.rows_scanned = 0
+        self.runs = 0
+        self.failures = 0
+
+    @classmethod
+    def from_results(
+        cls, name: str, query: str, results: list[TestResult], duration: float = 0.0
+    ) -> "Test":
+        """Rebuild an already executed test, e.g. from a worker or a shard report."""
+        test = cls(
+            name=name,
+            provider=None,  # type: ignore[arg-type]
+            query=query,
+            test_configs={},
+            providers={},
+        )
+        test.results = results
+        test.duration = duration
+        test.runs = 1
+        test.failures = int(not test.passed)
+        return test
+
+    @property
+    def passed(self) -> bool:
+        return all(result["passed"] for result in self.results)
+
+    def _can_stream(self) -> bool:
+        if self.parameter_group is not None:
+            return False
+        return bool(self.test_configs) and all(
+            TestFactory.get_test_class(test_type).accepts_stream(test_config)
+            for test_type, test_config in self.test_configs.items()
+        )
+
+    def _stream(self) -> Iterator[dict[str, Any]]:
+        self.rows_scanned = 0
+        for row in self.provider.stream_query(self.query):
+            self.rows_scanned += 1
+            yield row
+
+    def aggregate_expressions(self) -> dict[str, list[str]] | None:
+        """Aggregates needed by each check, or None if some check needs the rows."""
+        expressions = {}
+        for test_type, test_config in self.test_configs.items():
+            test_class = TestFactory.get_test_class(test_type)
+            check_expressions = test_class.aggregate_expressions(test_config)
+            if check_expressions is None:
+                return None
+            expressions[test_type] = check_expressions
+        return expressions or None
 
     def run(self) -> None:
-        query_results = self.provider.execute_query(self.query)
+        start_time = self.last_run = time.time()
+        self.results = []
+        timeout = self.timeout if self.timeout is not None else self.provider.timeout
+        with cancel_after(self.provider, timeout) as timed_out:
+            try:
+                self._run_checks()
+            except Exception:
+                if not timed_out.is_set():
+                    raise
+        if timed_out.is_set():
+            self.results = [
+                {
+                    "name": "timeout",
+                    "passed": False,
+                    "message": f"Test timed out after {timeout}s.",
+                    "details": {"timeout": timeout},
+                    "time": time.time() - start_time,
+                }
+            ]
+        self._finish_run(time.time() - start_time)
+
+    def run_aggregates(
+        self, values: dict[str, list[Any]], batch: dict[str, Any], duration: float
+    ) -> None:
+        """Evaluate the checks on aggregates computed by a batched query."""
+        self.last_run = time.time()
+        self.results = []
         for test_type, test_config in self.test_configs.items():
-            test = TestFactory.create_test(
-                test_type, test_config, query_results, self.providers
+            test = TestFactory.create_test(test_type, test_config, [], self.providers)
+            result = test.run_aggregate(values[test_type])
+            result["details"]["batch"] = batch
+            self.results.append(result)
+        self._finish_run(duration)
+
+    def _finish_run(self, duration: float) -> None:
+        self.duration = duration
+        self.runs += 1
+        if not self.passed:
+            self.failures += 1
+
+    def _run_checks(self) -> None:
+        fingerprint = None
+        if self.fingerprints is not None:
+            fingerprint = self.provider.fingerprint(self.query)
+            if fingerprint is not None and self.fingerprints.matches(
+                self.name, self.query, self.test_configs, fingerprint
+            ):
+                self.results.append(
+                    {
+                        "name": "fingerprint",
+                        "passed": True,
+                        "message": "Verified by fingerprint, results are unchanged "
+                        "since the last passing run.",
+                        "details": {
+                            "fingerprint": fingerprint,
+                            "skipped_checks": list(self.test_configs),
+                        },
+                        "time": time.time() - self.last_run,
+                    }
+                )
+                return
+
+        self._run_query_checks()
+        # Only record it if the data didn't change while the checks fetched it
+        if (
+            fingerprint is not None
+            and self.passed
+            and self.provider.fingerprint(self.query) == fingerprint
+        ):
+            self.fingerprints.record(  # type: ignore[union-attr]
+                self.name, self.query, self.test_configs, fingerprint
+            )
+
+    def _run_query_checks(self) -> None:
+        if self._can_stream():
+            # Every test consumes its own stream, the query is never fully loaded
+            for test_type, test_config in self.test_configs.items():
+                stream = cast(Sequence[dict[str, Any]], self._stream())
+                test = TestFactory.create_test(
+                    test_type, test_config, stream, self.providers
+                )
+                self.results.append(test.run())
+        else:
+            query_results: Sequence[dict[str, Any]]
+            if self.parameter_group is not None:
+                query_results = self.parameter_group.rows_for(self.parameter_index)
+            else:
+                query_results = self.provider.execute_query(self.query)
+            self.rows_scanned = len(query_results)
+            # Released with the results once the checks of this run are done
+            run_cache: dict[str, Any] = {}
+            for test_type, test_config in self.test_configs.items():
+                test = TestFactory.create_test(
+                    test_type, test_config, query_results, self.providers, run_cache
+                )
+                self.results.append(test.run())
+
+
+class ParameterGroup:
+    """
+    Runs the query of parameterized sub-tests once and routes rows to each of them.
+
+    The base query is filtered with an `IN` over the parameter columns for the
+    values of the sub-tests in the group. A `CASE` column computed by the database
+    gives the index of the values each row matches, so rows are routed with the
+    database's own comparisons, e.g. `1 = TRUE` or `3 = 3.0` on a REAL column.
+    """
+
+    # Column added to the grouped query, removed from the rows of the sub-tests
+    INDEX_COLUMN = "aqueductus_parameter_index"
+
+    def __init__(self, provider: Provider, query: str, columns: list[str]):
+        self.provider = provider
+        self.query = query
+        self.columns = columns
+        self._literals: list[tuple[str, ...]] = []
+        self._rows: list[list[dict[str, Any]]] | None = None
+        self._pending: set[int] = set()
+
+    def add(self, values: list[Any]) -> int:
+        """Register the values of a sub-test and return its index in the group."""
+        literals = tuple(sql_literal(value) for value in values)
+        # Sub-tests with the same values share their rows
+        if literals not in self._literals:
+            self._literals.append(literals)
+        return self._literals.index(literals)
+
+    def grouped_query(self) -> str:
+        conditions = []
+        for position, column in enumerate(self.columns):
+            literals = dict.fromkeys(values[position] for values in self._literals)
+            conditions.append(f"t.{column} IN ({', '.join(literals)})")
+        cases = " ".join(
+            "WHEN "
+            + " AND ".join(
+                f"t.{column} = {literal}"
+                for column, literal in zip(self.columns, values)
             )
-            self.results.append(test.run())
+            + f" THEN {index}"
+            for index, values in enumerate(self._literals)
+        )
+        return (
+            f"SELECT t.*, CASE {cases} END AS {self.INDEX_COLUMN} "
+            f"FROM {as_subquery(self.query)} AS t "
+            f"WHERE {' AND '.join(conditions)}"
+        )
+
+    def rows_for(self, index: int) -> list[dict[str, Any]]:
+        # Fetch again once every sub-test got its rows, or on a second request
+        if self._rows is None or index not in self._pending:
+            self._rows = [[] for _ in self._literals]
+            for row in self.provider.stream_query(self.grouped_query()):
+                row = dict(row)
+                row_index = row.pop(self.INDEX_COLUMN)
+                if row_index is not None:
+                    self._rows[int(row_index)].append(row)
+            self._pending = set(range(len(self._literals)))
+        self._pending.discard(index)
+        rows = self._rows[index]
+        if not self._pending:
+            self._rows = None
+        return rows
+
+
+@contextmanager
+def cancel_after(
+    provider: Provider, timeout: float | None
+) -> Iterator[threading.Event]:
+    """
+    Cancel the provider's running query if the block lasts more than `timeout`.
+
+    Yields an event that is set when the timeout expired.
+    """
+    timed_out = threading.Event()
+    if not timeout:
+        yield timed_out
+        return
+
+    def cancel() -> None:
+        timed_out.set()
+        try:
+            provider.cancel()
+        except NotImplementedError:
+            # The query can't be stopped, it is still reported as timed out
+            pass
+
+    timer = threading.Timer(timeout, cancel)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield timed_out
+    finally:
+        timer.cancel()
+
+
+def build_batch_query(
+    queries: list[str], expressions: list[list[str]]
+) -> tuple[str, list[list[str]]]:
+    """
+    Combine aggregates over several queries into a single-row query.
+
+    Each query becomes a derived table computing its aggregates, all of them cross
+    joined. Returns the query and the column alias of every expression.
+    """
+    tables = []
+    aliases = []
+    for i, (query, query_expressions) in enumerate(zip(queries, expressions)):
+        query_aliases = [f"b{i}_{j}" for j in range(len(query_expressions))]
+        select = ", ".join(
+            f"{expression} AS {alias}"
+            for expression, alias in zip(query_expressions, query_aliases)
+        )
+        tables.append(f"(SELECT {select} FROM {as_subquery(query)} AS t{i}) AS s{i}")
+        aliases.append(query_aliases)
+    return "SELECT * FROM " + "\nCROSS JOIN ".join(tables), aliases
 
 
 class TestConfig(TypedDict):
@@ -43,12 +333,32 @@ class TestConfig(TypedDict):
 class TestRunner:
     # Regex to match ${ENV_VAR_NAME} or $ENV_VAR_NAME
     _ENV_VAR_PATTERN = re.compile(r"\${([^}]+)}|\$(\S+)")
-    # Regex to match {{placeholder}}
-    _PLACEHOLDER_PATTERN = re.compile(r"<<(.+)>>")
+    # Regex to match <<placeholder>>
+    _PLACEHOLDER_PATTERN = re.compile(r"<<(.+?)>>")
 
-    def __init__(self, config_files: list[str]):
+    def __init__(
+        self,
+        config_files: list[str],
+        shard: tuple[int, int] | None = None,
+        history_path: str | None = None,
+        test_indexes: list[int] | None = None,
+        batch_size: int = 0,
+    ):
+        # Maximum number of aggregate-only tests combined in one query
+        self.batch_size = batch_size
+        self.history = DurationHistory(history_path)
+        self.fingerprints = FingerprintStore()
+        self.config_files = config_files
         self.placeholders = self._load_placeholders()
         self.config = self._load_config(config_files)
+        # Partition inputs of the shard, stored in its report to be checked on merge
+        self.shard_manifest: dict[str, Any] | None = None
+        if test_indexes is None:
+            test_indexes = self._select_shard(
+                list(range(len(self.config["tests"]))), shard
+            )
+        # Positions of the tests to run in the configs, in running order
+        self.test_indexes = test_indexes
         self.providers = self._init_providers()
         self.tests = self._init_tests()
 
@@ -90,35 +400,230 @@ class TestRunner:
                 yaml_text = self._ENV_VAR_PATTERN.sub(
                     self._replace_env_vars_text, yaml_text
                 )
+                # Test parameters are replaced when the tests are expanded
+                parameter_names = self._parameter_names(yaml_text)
                 yaml_text = self._PLACEHOLDER_PATTERN.sub(
-                    self._replace_placeholders_text, yaml_text
+                    partial(self._replace_placeholders_except, parameter_names),
+                    yaml_text,
                 )
 
                 config = yaml.safe_load(yaml_text)
                 if "providers" in config:
                     merged_config["providers"].extend(config["providers"])
-                if "tests" in config:
-                    merged_config["tests"].extend(config["tests"])
+                for test_config in config.get("tests", []):
+                    merged_config["tests"].extend(
+                        self._expand_parameters(
+                            test_config, f"{config_file}:{test_config['name']}"
+                        )
+                    )
         return merged_config
 
+    def _replace_placeholders_except(
+        self, parameter_names: set[str], match: Match[str]
+    ) -> str:
+        if match.group(1).strip() in parameter_names:
+            return match.group(0)
+        return self._replace_placeholders_text(match)
+
+    @staticmethod
+    def _parameter_names(yaml_text: str) -> set[str]:
+        try:
+            config = yaml.safe_load(yaml_text)
+        except yaml.YAMLError:
+            return set()
+        if not isinstance(config, dict):
+            return set()
+        return {
+            name
+            for test_config in config.get("tests") or []
+            for name in test_config.get("parameters") or {}
+        }
+
+    @classmethod
+    def _substitute_parameters(cls, value: Any, parameters: dict[str, Any]) -> Any:
+        if isinstance(value, dict):
+            return {
+                k: cls._substitute_parameters(v, parameters) for k, v in value.items()
+            }
+        if isinstance(value, list):
+            return [cls._substitute_parameters(v, parameters) for v in value]
+        if not isinstance(value, str):
+            return value
+        match = cls._PLACEHOLDER_PATTERN.fullmatch(value.strip())
+        if match and match.group(1).strip() in parameters:
+            # Keep the type of values used on their own, e.g. `value: <<count>>`
+            return parameters[match.group(1).strip()]
+        return cls._PLACEHOLDER_PATTERN.sub(
+            lambda m: str(parameters.get(m.group(1).strip(), m.group(0))), value
+        )
+
+    def _expand_parameters(
+        self, test_config: dict[str, Any], group_id: str
+    ) -> list[dict[str, Any]]:
+        """
+        Expand a test with a `parameters` block into one sub-test per combination.
+
+        Parameters with a `column` filter the query results on that column, which
+        lets all the sub-tests share a single grouped query. Other parameters are
+        replaced as text in the query and checks, like placeholders.
+        """
+        parameters = test_config.get("parameters")
+        if not parameters:
+            return [test_config]
+
+        names = list(parameters)
+        values = []
+        columns = {}
+        for name, parameter in parameters.items():
+            if isinstance(parameter, dict):
+                values.append(parameter["values"])
+                if "column" in parameter:
+                    columns[name] = parameter["column"]
+            else:
+                values.append(parameter)
+
+        base_config = {k: v for k, v in test_config.items() if k != "parameters"}
+        query = base_config.pop("query")
+        referenced = {
+            match.strip() for match in self._PLACEHOLDER_PATTERN.findall(query)
+        }
+        # The query only needs to be run once when every parameter is a filter
+        groupable = len(columns) == len(names) and not referenced & set(names)
+
+        sub_tests = []
+        for combination in itertools.product(*values):
+            combination_values = dict(zip(names, combination))
+            sub_test = self._substitute_parameters(base_config, combination_values)
+            sub_test["name"] = (
+                f"{test_config['name']}"
+                f"[{', '.join(f'{k}={v}' for k, v in combination_values.items())}]"
+            )
+            sub_query = self._substitute_parameters(
+                query,
+                {
+                    k: sql_literal(v) if k in columns else v
+                    for k, v in combination_values.items()
+                },
+            )
+            filters = [
+                f"t.{column} = {sql_literal(combination_values[name])}"
+                for name, column in columns.items()
+                if name not in referenced
+            ]
+            if filters:
+                sub_query = (
+                    f"SELECT * FROM {as_subquery(sub_query)} AS t "
+                    f"WHERE {' AND '.join(filters)}"
+                )
+            sub_test["query"] = sub_query
+            if groupable:
+                sub_test["parameter_group"] = {
+                    "id": group_id,
+                    "query": query,
+                    "columns": list(columns.values()),
+                    "values": list(combination),
+                }
+            sub_tests.append(sub_test)
+        return sub_tests
+
+    def _select_shard(
+        self, test_indexes: list[int], shard: tuple[int, int] | None
+    ) -> list[int]:
+        """Return the subset of `test_indexes` that belongs to `shard`."""
+        if shard is None:
+            return test_indexes
+        index, count = shard
+        names = [self.config["tests"][i]["name"] for i in test_indexes]
+        durations = fill_missing_durations([self.history.get(n) for n in names])
+        bucket = partition(names, durations, count)[index - 1]
+        self.shard_manifest = shard_manifest(index, count, names, durations)
+        return sorted(test_indexes[i] for i in bucket)
+
+    @staticmethod
+    def _create_provider(provider_config: dict[str, Any]) -> Provider:
+        provider = ProviderFactory.create_provider(
+            provider_config["type"],
+            provider_config["config"],
+        )
+        provider.timeout = provider_config.get("timeout")
+        return provider
+
     def _init_providers(self) -> dict[str, Provider]:
         providers = {}
         for provider_config in self.config["providers"]:
-            providers[provider_config["name"]] = ProviderFactory.create_provider(
-                provider_config["type"],
-                provider_config["config"],
-            )
+            providers[provider_config["name"]] = self._create_provider(provider_config)
         return providers
 
+    def reconnect_providers(self, test: Test | None = None) -> list[str]:
+        """
+        Recreate the providers whose connection was lost and return their names.
+
+        When `test` is given, only the providers it queries are checked, since each
+        check is a query on the server (billed on e.g. Athena).
+        """
+        checked = None
+        if test is not None:
+            checked = [test.provider]
+            if test.parameter_group is not None:
+                checked.append(test.parameter_group.provider)
+        reconnected = []
+        for provider_config in self.config["providers"]:
+            name = provider_config["name"]
+            old_provider = self.providers[name]
+            if checked is not None and not any(old_provider is p for p in checked):
+                continue
+            if old_provider.is_connected():
+                continue
+            provider = self._create_provider(provider_config)
+            try:
+                old_provider.close()
+            except Exception:
+                # The connection is already broken
+                pass
+            # The tests share this dict, so checks reading other providers see it
+            self.providers[name] = provider
+            for test in self.tests:
+                if test.provider is old_provider:
+                    test.provider = provider
+                group = test.parameter_group
+                if group is not None and group.provider is old_provider:
+                    group.provider = provider
+            reconnected.append(name)
+        return reconnected
+
     def _init_tests(self) -> list[Test]:
         tests = []
-        for test_config in self.config["tests"]:
+        groups: dict[str, ParameterGroup] = {}
+        for index in self.test_indexes:
+            test_config = self.config["tests"][index]
             provider = self.providers[test_config["provider"]]
+            group = None
+            parameter_index = 0
+            if "parameter_group" in test_config:
+                group_config = test_config["parameter_group"]
+                if group_config["id"] not in groups:
+                    groups[group_config["id"]] = ParameterGroup(
+                        provider, group_config["query"], group_config["columns"]
+                    )
+                group = groups[group_config["id"]]
+                parameter_index = group.add(group_config["values"])
             test_specific_configs = {
                 k: v
                 for k, v in test_config.items()
                 if k in TestFactory.list_available_tests()
             }
+            if test_config.get("fingerprint"):
+                external = [
+                    test_type
+                    for test_type, config in test_specific_configs.items()
+                    if TestFactory.get_test_class(test_type).reads_external_rows(config)
+                ]
+                if external:
+                    raise ValueError(
+                        f"Test '{test_config['name']}' can't use a fingerprint, "
+                        f"these checks read rows from outside its query: "
+                        f"{', '.join(external)}"
+                    )
             tests.append(
                 Test(
                     name=test_config["name"],
@@ -126,11 +631,180 @@ class TestRunner:
                     query=test_config["query"],
                     test_configs=test_specific_configs,
                     providers=self.providers,
+                    interval=test_config.get("interval"),
+                    priority=test_config.get("priority", 0),
+                    timeout=test_config.get("timeout"),
+                    fingerprints=(
+                        self.fingerprints if test_config.get("fingerprint") else None
+                    ),
+                    parameter_group=group,
+                    parameter_index=parameter_index,
                 )
             )
         return tests
 
-    def run_all(self) -> list[Test]:
+    def close(self) -> None:
+        for provider in self.providers.values():
+            provider.close()
+
+    def estimate_durations(self) -> list[tuple[float, str]]:
+        """Estimated seconds of each test and where the estimate comes from."""
+        costs = []
+        for test in self.tests:
+            try:
+                costs.append(test.provider.estimate_cost(test.query))
+            except (RuntimeError, LookupError, TypeError, ValueError):
+                # Queries that can't be explained, or plans that can't be parsed,
+                # fall back to the history
+                costs.append(None)
+        return estimate_durations(
+            [self.history.get(test.name) for test in self.tests],
+            costs,
+            [test.provider.provider_name for test in self.tests],
+        )
+
+    def plan(self, workers: int) -> list[list[tuple[int, float, str]]]:
+        """
+        Assign the tests to `workers`, longest first, balancing estimated durations.
+
+        Each worker gets a list of `(position in self.tests, seconds, source)`.
+        """
+        estimates = self.estimate_durations()
+        buckets = partition(
+            [test.name for test in self.tests],
+            [seconds for seconds, _ in estimates],
+            workers,
+        )
+        return [[(i, *estimates[i]) for i in bucket] for bucket in buckets]
+
+    def _find_batches(self) -> list[list[Test]]:
+        """Group compatible aggregate-only tests of the same provider."""
+        if self.batch_size < 2:
+            return []
+        candidates: dict[int, list[Test]] = {}
+        for test in self.tests:
+            # Tests with their own timeout, fingerprint or group can't share a query
+            if (
+                test.timeout is None
+                and test.fingerprints is None
+                and test.parameter_group is None
+                and test.aggregate_expressions() is not None
+            ):
+                candidates.setdefault(id(test.provider), []).append(test)
+
+        batches = []
+        for tests in candidates.values():
+            for start in range(0, len(tests), self.batch_size):
+                batch = tests[start : start + self.batch_size]
+                if len(batch) > 1:
+                    batches.append(batch)
+        return batches
+
+    def _run_batch(self, tests: list[Test]) -> None:
+        start_time = time.time()
+        expressions = [test.aggregate_expressions() or {} for test in tests]
+        query, aliases = build_batch_query(
+            [test.query for test in tests],
+            [[e for check in checks.values() for e in check] for checks in expressions],
+        )
+        provider = tests[0].provider
+        try:
+            with cancel_after(provider, provider.timeout) as timed_out:
+                row = provider.execute_query(query)[0]
+            if timed_out.is_set():
+                raise TimeoutError(f"Batched query timed out after {provider.timeout}s")
+        except Exception as e:
+            # Run the tests on their own, which reports the failing one precisely
+            batch = {"tests": [test.name for test in tests], "error": str(e)}
+            for test in tests:
+                test.run()
+                for result in test.results:
+                    result["details"]["batch"] = batch
+            return
+
+        batch = {"tests": [test.name for test in tests]}
+        duration = (time.time() - start_time) / len(tests)
+        for test, checks, test_aliases in zip(tests, expressions, aliases):
+            values = {}
+            columns = iter(test_aliases)
+            for test_type, check_expressions in checks.items():
+                values[test_type] = [row[next(columns)] for _ in check_expressions]
+            test.run_aggregates(values, batch, duration)
+
+    def run_all(self, record_history: bool = True) -> list[Test]:
+        batches = {id(batch[0]): batch for batch in self._find_batches()}
+        batched = {id(test) for batch in batches.values() for test in batch}
+        for test in self.tests:
+            if id(test) in batches:
+                self._run_batch(batches[id(test)])
+            elif id(test) not in batched:
+                test.run()
         for test in self.tests:
-            test.run()
+            self.history.record(test.name, test.duration)
+        if record_history:
+            self.history.save()
+        self.fingerprints.save()
         return self.tests
+
+
+def _run_worker(
+    config_files: list[str],
+    test_indexes: list[int],
+    history_path: str | None,
+    batch_size: int,
+) -> list[tuple[int, str, str, list[TestResult], float]]:
+    runner = TestRunner(
+        config_files,
+        history_path=history_path,
+        test_indexes=test_indexes,
+        batch_size=batch_size,
+    )
+    tests = runner.run_all(record_history=False)
+    return [
+        (index, test.name, test.query, test.results, test.duration)
+        for index, test in zip(runner.test_indexes, tests)
+    ]
+
+
+def run_parallel(
+    planner: TestRunner,
+    workers: int,
+    history_path: str | None = None,
+    batch_size: int = 0,
+    record_history: bool = True,
+) -> list[Test]:
+    """
+    Run the tests of `planner` in `workers` processes, each one owning its own
+    provider connections. Tests are assigned with the cost-aware plan, so every
+    worker starts with its longest tests. The planner's connections are closed.
+    """
+    try:
+        plan = planner.plan(workers)
+    finally:
+        planner.close()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _run_worker,
+                planner.config_files,
+                [planner.test_indexes[i] for i, _, _ in bucket],
+                history_path,
+                batch_size,
+            )
+            for bucket in plan
+            if bucket
+        ]
+        executed = sorted(
+            (entry for future in futures for entry in future.result()),
+            key=lambda entry: entry[0],
+        )
+
+    history = DurationHistory(history_path)
+    tests = []
+    for _, name, query, results, duration in executed:
+        history.record(name, duration)
+        tests.append(Test.from_results(name, query, results, duration))
+    if record_history:
+        history.save()
+    return tests
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import re
+from collections import Counter
+from statistics import median
+from typing import Any, Sequence
+
+# Assumed duration (in seconds) for tests without any recorded history
+DEFAULT_DURATION = 1.0
+
+_SHARD_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    match = _SHARD_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid shard '{value}', expected the form 'i/N'")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}', index must be between 1 and N")
+    return index, count
+
+
+def fill_missing_durations(durations: Sequence[float | None]) -> list[float]:
+    known = [duration for duration in durations if duration is not None]
+    default = median(known) if known else DEFAULT_DURATION
+    return [default if duration is None else duration for duration in durations]
+
+
+def estimate_durations(
+    durations: Sequence[float | None],
+    costs: Sequence[float | None],
+    groups: Sequence[str],
+) -> list[tuple[float, str]]:
+    """
+    Estimate the duration of each item and the source of the estimate.
+
+    Recorded durations are used when available. Otherwise the planner cost (e.g. from
+    EXPLAIN) is converted to seconds with the ratio between durations and costs of
+    the items of the same group (provider) that have both. When no item of the group
+    has a duration yet, costs are scaled around the default duration instead.
+    """
+    default = fill_missing_durations([*durations, None])[-1]
+    seconds_per_cost: dict[str, float] = {}
+    for group in set(groups):
+        group_items = [
+            (duration, cost)
+            for duration, cost, item_group in zip(durations, costs, groups)
+            if item_group == group and cost
+        ]
+        known = [(d, c) for d, c in group_items if d is not None]
+        if known:
+            seconds_per_cost[group] = sum(d for d, _ in known) / sum(
+                c for _, c in known
+            )
+        elif group_items:
+            seconds_per_cost[group] = default / median(c for _, c in group_items)
+
+    estimates = []
+    for duration, cost, group in zip(durations, costs, groups):
+        if duration is not None:
+            estimates.append((duration, "history"))
+        elif cost and group in seconds_per_cost:
+            estimates.append((cost * seconds_per_cost[group], "explain"))
+        else:
+            estimates.append((default, "default"))
+    return estimates
+
+
+def format_plan(buckets: Sequence[Sequence[tuple[str, float, str]]]) -> str:
+    """Render the `(name, seconds, source)` items assigned to each worker."""
+    lines = []
+    totals = [sum(seconds for _, seconds, _ in bucket) for bucket in buckets]
+    for index, (bucket, total) in enumerate(zip(buckets, totals), start=1):
+        lines.append(f"Worker {index} (estimated {total:.2f}s):")
+        for name, seconds, source in bucket:
+            lines.append(f"  {seconds:>10.2f}s  {name} [{source}]")
+    if totals:
+        critical = max(range(len(totals)), key=lambda i: totals[i])
+        lines.append(
+            f"Estimated critical path: {totals[critical]:.2f}s (worker {critical + 1})"
+        )
+    return "\n".join(lines)
+
+
+def partition(
+    names: Sequence[str], durations: Sequence[float], count: int
+) -> list[list[int]]:
+    """
+    Split items into `count` buckets with balanced total duration.
+
+    Uses the longest-processing-time-first heuristic. Ties are broken by name and
+    bucket index so every shard computes the same assignment from the same history.
+    Each bucket lists item indexes, longest first.
+    """
+    buckets: list[list[int]] = [[] for _ in range(count)]
+    loads = [0.0] * count
+    order = sorted(range(len(names)), key=lambda i: (-durations[i], names[i]))
+    for index in order:
+        bucket = min(range(count), key=lambda b: (loads[b], b))
+        buckets[bucket].append(index)
+        loads[bucket] += durations[index]
+    return buckets
+
+
+def shard_manifest(
+    index: int, count: int, names: Sequence[str], durations: Sequence[float]
+) -> dict[str, Any]:
+    """Describe the inputs a shard was partitioned from, whatever their order."""
+    pairs = sorted(zip(names, durations))
+    digest = hashlib.sha256(json.dumps(pairs).encode()).hexdigest()
+    return {
+        "index": index,
+        "count": count,
+        "tests": [name for name, _ in pairs],
+        "inputs": digest,
+    }
+
+
+def check_shards(
+    manifests: Sequence[dict[str, Any] | None], names: Sequence[str]
+) -> list[str]:
+    """
+    Return the problems found when merging the results of several shards.
+
+    `manifests` has the shard manifest of every report (None for reports of runs
+    without shards) and `names` the tests found in all the reports.
+    """
+    problems = [
+        f"Test '{name}' is in several reports"
+        for name, times in Counter(names).items()
+        if times > 1
+    ]
+    shards = [manifest for manifest in manifests if manifest is not None]
+    if not shards:
+        return problems
+    if len(shards) != len(manifests):
+        return [*problems, "Reports of sharded and unsharded runs can't be merged"]
+
+    first = shards[0]
+    if any(
+        (m["count"], m["tests"], m["inputs"])
+        != (first["count"], first["tests"], first["inputs"])
+        for m in shards
+    ):
+        # Each shard picked its tests from different configs or durations
+        return [
+            *problems,
+            "Shards were partitioned from different tests or duration histories, "
+            "use the same --history file on every runner",
+        ]
+
+    indexes = Counter(m["index"] for m in shards)
+    problems += [
+        f"Shard {i}/{first['count']} is in several reports"
+        for i in indexes
+        if indexes[i] > 1
+    ]
+    problems += [
+        f"Shard {i}/{first['count']} is missing"
+        for i in range(1, first["count"] + 1)
+        if i not in indexes
+    ]
+    expected = set(first["tests"])
+    found = set(names)
+    problems += [
+        f"Test '{name}' is missing" for name in first["tests"] if name not in found
+    ]
+    problems += [
+        f"Test '{name}' is unexpected" for name in names if name not in expected
+    ]
+    return problems
@@ -0,0 +1,98 @@
+import hashlib
+import math
+from typing import Any
+
+
+def hash_key(key: tuple[Any, ...]) -> int:
+    """64-bit hash of a key, stable across processes (unlike `hash`)."""
+    data = "\x1f".join("\x00" if value is None else str(value) for value in key)
+    return int.from_bytes(hashlib.blake2b(data.encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """
+    Distinct-count estimate in fixed memory.
+
+    Uses `2 ** precision` one-byte registers, with a relative standard error of
+    about `1.04 / sqrt(2 ** precision)` (0.8% with the default precision of 14).
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"Precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    @property
+    def standard_error(self) -> float:
+        return 1.04 / math.sqrt(self.size)
+
+    def add(self, key_hash: int) -> None:
+        index = key_hash >> (64 - self.precision)
+        remaining = key_hash & ((1 << (64 - self.precision)) - 1)
+        # Position of the leftmost 1 bit in the remaining bits
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> float:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        raw = alpha * self.size**2 / sum(2.0**-r for r in self.registers)
+        empty = self.registers.count(0)
+        if raw <= 2.5 * self.size and empty:
+            # Linear counting is more accurate for small cardinalities
+            return self.size * math.log(self.size / empty)
+        return raw
+
+
+class BloomFilter:
+    """
+    Set membership with no false negatives and a bounded false positive rate.
+
+    The bit array is sized for `expected_items` at `false_positive_rate`. Bit
+    positions are derived from a single 64-bit hash by double hashing.
+    """
+
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.001):
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(
+                f"False positive rate must be between 0 and 1, got {false_positive_rate}"
+            )
+        expected_items = max(expected_items, 1)
+        self.size = max(
+            math.ceil(
+                -expected_items * math.log(false_positive_rate) / math.log(2) ** 2
+            ),
+            8,
+        )
+        self.hash_count = max(round(self.size / expected_items * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.items = 0
+
+    def _positions(self, key_hash: int) -> list[int]:
+        first = key_hash & 0xFFFFFFFF
+        # Odd step, so positions don't repeat when the size is even
+        second = (key_hash >> 32) | 1
+        size = self.size
+        return [(first + i * second) % size for i in range(self.hash_count)]
+
+    def add(self, key_hash: int) -> None:
+        bits = self.bits
+        for position in self._positions(key_hash):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.items += 1
+
+    def __contains__(self, key_hash: int) -> bool:
+        bits = self.bits
+        for position in self._positions(key_hash):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false positive rate for the items added so far."""
+        return (
+            1 - math.exp(-self.hash_count * self.items / self.size)
+        ) ** self.hash_count
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where saves aren't serialized
+    fcntl = None  # type: ignore[assignment]
+
+STATE_DIR = Path(".aqueductus")
+
+
+class StateFile:
+    """JSON document persisted between runs under the local state directory."""
+
+    file_name: str
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else STATE_DIR / self.file_name
+        self.data: dict[str, Any] = self._load()
+        self._changed: set[str] = set()
+
+    def _load(self) -> dict[str, Any]:
+        if not self.path.is_file():
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def set(self, key: str, value: Any) -> None:
+        self.data[key] = value
+        self._changed.add(key)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # Serializes the saves of every process sharing the file
+        with open(self.path.with_suffix(f"{self.path.suffix}.lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def save(self) -> None:
+        if not self._changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            # Only write our own changes, other processes may share the same file
+            data = self._load()
+            data.update({key: self.data[key] for key in self._changed})
+            tmp_path = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.tmp")
+            with open(tmp_path, "w+") as f:
+                json.dump(data, f, indent=2, sort_keys=True, default=str)
+            tmp_path.replace(self.path)
+        self.data = data
+        self._changed.clear()
+
+
+class DurationHistory(StateFile):
+    file_name = "history.json"
+
+    # Weight of the latest run in the exponential moving average
+    _SMOOTHING = 0.5
+
+    def get(self, test_name: str) -> float | None:
+        duration = self.data.get(test_name)
+        return float(duration) if duration is not None else None
+
+    def record(self, test_name: str, duration: float) -> None:
+        previous = self.get(test_name)
+        if previous is not None:
+            duration = self._SMOOTHING * duration + (1 - self._SMOOTHING) * previous
+        self.set(test_name, round(duration, 6))
+
+
+class FingerprintStore(StateFile):
+    """Result fingerprints of the last passing run of each test."""
+
+    file_name = "fingerprints.json"
+
+    @staticmethod
+    def _definition_hash(query: str, checks: dict[str, Any]) -> str:
+        # A stored fingerprint is only valid for the same query and checks
+        definition = json.dumps(
+            {"query": query, "checks": checks}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(definition.encode()).hexdigest()
+
+    def matches(
+        self, test_name: str, query: str, checks: dict[str, Any], fingerprint: str
+    ) -> bool:
+        stored = self.data.get(test_name)
+        return stored == {
+            "definition": self._definition_hash(query, checks),
+            "fingerprint": fingerprint,
+        }
+
+    def record(
+        self, test_name: str, query: str, checks: dict[str, Any], fingerprint: str
+    ) -> None:
+        self.set(
+            test_name,
+            {
+                "definition": self._definition_hash(query, checks),
+                "fingerprint": fingerprint,
+            },
+        )
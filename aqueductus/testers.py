@@ -3,9 +3,29 @@ import inspect
 import re
 import time
 from abc import ABC, abstractmethod
-from typing import Any, ClassVar, Sequence, Type, TypedDict
+from datetime import date
+from decimal import Decimal
+from itertools import chain, groupby
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Iterable,
+    Iterator,
+    Sequence,
+    Type,
+    TypedDict,
+)
 
 from aqueductus.providers import Provider
+from aqueductus.sketches import BloomFilter, HyperLogLog, hash_key
+from aqueductus.utils import as_subquery, external_sort
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
 
 
 class TestFactory:
@@ -18,15 +38,23 @@ class TestFactory:
         test_config: Any,
         query_results: Sequence[dict[str, Any]],
         providers: dict[str, Provider],
+        run_cache: dict[str, Any] | None = None,
     ) -> "DataTest":
+        test = cls.get_test_class(test_type)(
+            query_results=query_results, config=test_config, providers=providers
+        )
+        if run_cache is not None:
+            test.run_cache = run_cache
+        return test
+
+    @classmethod
+    def get_test_class(cls, test_type: str) -> Type["DataTest"]:
         if test_type not in cls._tests:
             raise ValueError(
                 f"Unknown test type: {test_type}. "
                 f"Available formats: {list(cls._tests.keys())}"
             )
-        return cls._tests[test_type](
-            query_results=query_results, config=test_config, providers=providers
-        )
+        return cls._tests[test_type]
 
     @classmethod
     def register_test(cls, name: str, test_class: Type["DataTest"]) -> None:
@@ -44,15 +72,17 @@ class RowLoader(ABC):
     def load_rows(self, config: dict[str, Any]) -> list[dict[str, Any]]:
         pass
 
+    def iter_rows(self, config: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        yield from self.load_rows(config)
+
 
 class CsvRowLoader(RowLoader):
     def load_rows(self, config: dict[str, Any]) -> list[dict[str, Any]]:
-        rows = []
+        return list(self.iter_rows(config))
+
+    def iter_rows(self, config: dict[str, Any]) -> Iterator[dict[str, Any]]:
         with open(config["path"], mode="r") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                rows.append(row)
-        return rows
+            yield from csv.DictReader(file)
 
 
 class ProviderRowLoader(RowLoader):
@@ -66,6 +96,12 @@ class ProviderRowLoader(RowLoader):
         column_map = config.get("map", {})
         return [{column_map.get(k, k): v for k, v in row.items()} for row in result]
 
+    def iter_rows(self, config: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        provider = self.providers[config["provider"]]
+        column_map = config.get("map", {})
+        for row in provider.stream_query(config["query"]):
+            yield {column_map.get(k, k): v for k, v in row.items()}
+
 
 class InlineRowLoader(RowLoader):
     def load_rows(self, config: dict[str, Any]) -> list[dict[str, Any]]:
@@ -121,14 +157,57 @@ class DataTest(ABC):
         self.query_results = query_results
         self.config = config
         self.providers = providers
+        # Shared by the checks of the same test run, e.g. to convert the rows once
+        self.run_cache: dict[str, Any] = {}
+
+    @classmethod
+    def accepts_stream(cls, config: Any) -> bool:
+        """
+        Whether the test only iterates once over the query results.
+
+        When every test of a query accepts a stream, each one receives its own
+        iterator over the rows instead of a fully loaded list.
+        """
+        return False
+
+    @classmethod
+    def aggregate_expressions(cls, config: Any) -> list[str] | None:
+        """
+        SQL aggregate expressions over the query that are enough to evaluate the test.
+
+        Tests that return them can be batched with other aggregate-only tests of the
+        same provider into a single query, then evaluated with `run_aggregate`.
+        Tests that need the rows return None.
+        """
+        return None
+
+    @classmethod
+    def reads_external_rows(cls, config: Any) -> bool:
+        """
+        Whether the test loads rows from outside the query, e.g. a CSV or a provider.
+
+        Those rows aren't covered by the query fingerprint, so tests that read them
+        can't be skipped when the query results are unchanged.
+        """
+        return False
 
     @abstractmethod
     def _run_test(self) -> TestResultCore:
         pass
 
+    def _run_aggregate_test(self, values: list[Any]) -> TestResultCore:
+        raise NotImplementedError(f"Test '{self.test_name}' can't run on aggregates")
+
     def run(self) -> TestResult:
+        return self._timed_run(self._run_test)
+
+    def run_aggregate(self, values: list[Any]) -> TestResult:
+        """Evaluate the test on the values of its `aggregate_expressions`."""
+        return self._timed_run(lambda: self._run_aggregate_test(values))
+
+    def _timed_run(self, run_test: Callable[[], TestResultCore]) -> TestResult:
         start_time = time.time()
-        result = self._run_test()
+        result = run_test()
         end_time = time.time()
         return {
             "name": self.test_name,
@@ -140,6 +219,10 @@ class DataTest(ABC):
 
 
 class BaseRowTest(DataTest, ABC):
+    @classmethod
+    def reads_external_rows(cls, config: Any) -> bool:
+        return config.get("source", "inline") != "inline"
+
     def __init__(
         self,
         query_results: Sequence[dict[str, Any]],
@@ -262,9 +345,18 @@ class NotContainsRowsTest(BaseRowTest):
 class RowCountTest(DataTest):
     test_name = "row_count"
 
+    @classmethod
+    def aggregate_expressions(cls, config: Any) -> list[str] | None:
+        return ["COUNT(*)"]
+
     def _run_test(self) -> TestResultCore:
+        return self._evaluate(len(self.query_results))
+
+    def _run_aggregate_test(self, values: list[Any]) -> TestResultCore:
+        return self._evaluate(int(values[0]))
+
+    def _evaluate(self, actual_count: int) -> TestResultCore:
         expected_count = self.config
-        actual_count = len(self.query_results)
         passed = actual_count == expected_count
         message = (
             f"Row count matches: {actual_count} == {expected_count}"
@@ -364,7 +456,32 @@ class ColumnRatioTest(DataTest):
 class AllRowsMatchTest(BaseRowTest):
     test_name = "all_rows_match"
 
+    @classmethod
+    def accepts_stream(cls, config: Any) -> bool:
+        return "key_columns" in config
+
+    def __init__(
+        self,
+        query_results: Sequence[dict[str, Any]],
+        config: Any,
+        providers: dict[str, Provider],
+    ):
+        self.key_columns: list[str] = list(config.get("key_columns", []))
+        if not self.key_columns:
+            super().__init__(query_results, config, providers)
+            return
+
+        # Sorted-merge mode, rows are streamed from both sides instead of loaded
+        DataTest.__init__(self, query_results, config, providers)
+        self.ignore_columns = set(config.get("ignore_columns", []))
+        self.presorted = bool(config.get("presorted", False))
+        self.max_rows_in_memory = int(config.get("max_rows_in_memory", 100_000))
+        self.max_reported_rows = int(config.get("max_reported_rows", 100))
+
     def _run_test(self) -> TestResultCore:
+        if self.key_columns:
+            return self._run_merge_test()
+
         non_matching = [
             row
             for row in self.actual_rows
@@ -388,3 +505,539 @@ class AllRowsMatchTest(BaseRowTest):
             "message": message,
             "details": details,
         }
+
+    def _sort_key(self, row: dict[str, Any]) -> tuple[Any, ...]:
+        # Nulls are sorted last and never compared with other values
+        key = []
+        for column in self.key_columns:
+            value = row[column]
+            if isinstance(value, dict):
+                raise ValueError(
+                    f"Key column '{column}' must hold plain values, got {value}"
+                )
+            key.append((value is None, value))
+        return tuple(key)
+
+    def _sorted_rows(
+        self, rows: Iterable[dict[str, Any]]
+    ) -> Iterator[tuple[tuple[Any, ...], dict[str, Any]]]:
+        """Yield `(sort_key, row)` pairs, computing every key only once."""
+        keyed_rows: Iterator[tuple[tuple[Any, ...], dict[str, Any]]] = (
+            (self._sort_key(row), row)
+            for row in (
+                {k: v for k, v in row.items() if k not in self.ignore_columns}
+                for row in rows
+            )
+        )
+        first = next(keyed_rows, None)
+        if first is None:
+            return
+        keyed_rows = chain([first], keyed_rows)
+        if not self.presorted or not self._has_ordered_key(first[0]):
+            yield from external_sort(keyed_rows, itemgetter(0), self.max_rows_in_memory)
+            return
+
+        previous_key = None
+        for key, row in keyed_rows:
+            if previous_key is not None and key < previous_key:
+                raise ValueError(
+                    f"Rows are not sorted by key columns {self.key_columns}: "
+                    f"{key} found after {previous_key}. With presorted, queries "
+                    "must ORDER BY the key columns with NULLS LAST"
+                )
+            previous_key = key
+            yield key, row
+
+    @staticmethod
+    def _has_ordered_key(key: tuple[Any, ...]) -> bool:
+        # Databases sort numbers and dates like Python, but text depends on the
+        # collation (e.g. case-insensitive), and nulls may come first
+        return all(isinstance(value, (int, float, Decimal, date)) for _, value in key)
+
+    def _run_merge_test(self) -> TestResultCore:
+        loader = RowLoaderFactory(self.providers).get_loader(
+            self.config.get("source", "inline")
+        )
+        expected_groups = groupby(
+            self._sorted_rows(loader.iter_rows(self.config)), key=itemgetter(0)
+        )
+        expected_key, expected_group = next(expected_groups, (None, None))
+
+        total_actual = 0
+        non_matching_count = 0
+        non_matching: list[dict[str, Any]] = []
+        try:
+            for actual_key, actual_group in groupby(
+                self._sorted_rows(self.query_results), key=itemgetter(0)
+            ):
+                while expected_key is not None and expected_key < actual_key:
+                    expected_key, expected_group = next(expected_groups, (None, None))
+                candidates = (
+                    [row for _, row in expected_group]  # type: ignore[union-attr]
+                    if expected_key == actual_key
+                    else []
+                )
+                for _, row in actual_group:
+                    total_actual += 1
+                    if any(self._row_matches(c, row) for c in candidates):
+                        continue
+                    non_matching_count += 1
+                    if len(non_matching) < self.max_reported_rows:
+                        non_matching.append(row)
+        except TypeError as e:
+            raise ValueError(
+                f"Key columns {self.key_columns} have values that can't be compared "
+                f"between the actual and expected rows: {e}"
+            ) from e
+
+        passed = not non_matching_count
+        message = (
+            "All actual rows match the expected rows."
+            if passed
+            else f"Found {non_matching_count} non-matching rows."
+        )
+        details = {
+            "non_matching_rows": non_matching,
+            "non_matching_count": non_matching_count,
+            "total_actual": total_actual,
+            "key_columns": self.key_columns,
+            "ignored_columns": list(self.ignore_columns),
+        }
+
+        return {
+            "passed": passed,
+            "message": message,
+            "details": details,
+        }
+
+
+class UniqueColumnsTest(DataTest):
+    """
+    Checks that the combination of `columns` is unique across the rows.
+
+    Rows are streamed: the exact mode keeps a hash set of the keys seen, while the
+    approximate mode estimates the distinct keys with a HyperLogLog sketch of fixed
+    size. Like SQL unique constraints, keys with a null value are ignored.
+    """
+
+    test_name = "unique_columns"
+
+    @classmethod
+    def accepts_stream(cls, config: Any) -> bool:
+        return True
+
+    def __init__(
+        self,
+        query_results: Sequence[dict[str, Any]],
+        config: Any,
+        providers: dict[str, Provider],
+    ):
+        super().__init__(query_results, config, providers)
+        if not isinstance(config, dict):
+            config = {"columns": config}
+        columns = config["columns"]
+        self.columns: list[str] = [columns] if isinstance(columns, str) else columns
+        self.mode = config.get("mode", "exact")
+        if self.mode not in ("exact", "approximate"):
+            raise ValueError(
+                f"Invalid unique_columns mode '{self.mode}', "
+                "expected 'exact' or 'approximate'"
+            )
+        self.max_reported_keys = int(config.get("max_reported_keys", 100))
+        self.precision = int(config.get("precision", 14))
+        self.max_duplicate_ratio = config.get("max_duplicate_ratio")
+
+    def _keys(self) -> Iterator[tuple[Any, ...]]:
+        get_key = itemgetter(*self.columns)
+        for row in self.query_results:
+            key = get_key(row)
+            if len(self.columns) == 1:
+                key = (key,)
+            if None not in key:
+                yield key
+
+    def _run_test(self) -> TestResultCore:
+        if self.mode == "approximate":
+            return self._run_approximate_test()
+
+        seen: set[tuple[Any, ...]] = set()
+        duplicates: dict[tuple[Any, ...], int] = {}
+        total_keys = 0
+        duplicate_rows = 0
+        for key in self._keys():
+            total_keys += 1
+            if key not in seen:
+                seen.add(key)
+                continue
+            duplicate_rows += 1
+            if key in duplicates:
+                duplicates[key] += 1
+            elif len(duplicates) < self.max_reported_keys:
+                duplicates[key] = 2
+
+        passed = not duplicate_rows
+        message = (
+            f"All {total_keys} keys are unique."
+            if passed
+            else f"Found {duplicate_rows} rows with a duplicated key."
+        )
+        details = {
+            "columns": self.columns,
+            "total_keys": total_keys,
+            "distinct_keys": len(seen),
+            "duplicate_rows": duplicate_rows,
+            "duplicated_keys": [
+                {"key": dict(zip(self.columns, key)), "count": count}
+                for key, count in duplicates.items()
+            ],
+        }
+
+        return {
+            "passed": passed,
+            "message": message,
+            "details": details,
+        }
+
+    def _run_approximate_test(self) -> TestResultCore:
+        sketch = HyperLogLog(self.precision)
+        total_keys = 0
+        for key in self._keys():
+            total_keys += 1
+            sketch.add(hash_key(key))
+
+        # By default, accept differences within 3 standard errors of the estimate
+        max_ratio = (
+            float(self.max_duplicate_ratio)
+            if self.max_duplicate_ratio is not None
+            else 3 * sketch.standard_error
+        )
+        estimated_distinct = min(sketch.estimate(), total_keys)
+        duplicate_ratio = 1 - estimated_distinct / total_keys if total_keys else 0.0
+
+        passed = duplicate_ratio <= max_ratio
+        message = (
+            f"Estimated {round(estimated_distinct)} distinct keys out of "
+            f"{total_keys}, within the expected error."
+            if passed
+            else f"Estimated {round(estimated_distinct)} distinct keys out of "
+            f"{total_keys}, about {round(total_keys - estimated_distinct)} "
+            "rows have a duplicated key."
+        )
+        details = {
+            "columns": self.columns,
+            "total_keys": total_keys,
+            "estimated_distinct_keys": round(estimated_distinct),
+            "estimated_duplicate_ratio": duplicate_ratio,
+            "max_duplicate_ratio": max_ratio,
+            "standard_error": sketch.standard_error,
+        }
+
+        return {
+            "passed": passed,
+            "message": message,
+            "details": details,
+        }
+
+
+class ReferencesTest(DataTest):
+    """
+    Checks that every key of the query results exists in the referenced rows.
+
+    The referenced keys are streamed into an exact set, which is moved into a Bloom
+    filter once there are more than `max_exact_keys` of them. The query results are
+    then streamed and looked up one by one, so memory only depends on the referenced
+    keys. Keys missing from the filter are always violations; a Bloom filter may
+    only miss a few of them, at its false positive rate.
+    """
+
+    test_name = "references"
+
+    @classmethod
+    def accepts_stream(cls, config: Any) -> bool:
+        return True
+
+    @classmethod
+    def reads_external_rows(cls, config: Any) -> bool:
+        return config.get("source", "provider") != "inline"
+
+    def __init__(
+        self,
+        query_results: Sequence[dict[str, Any]],
+        config: Any,
+        providers: dict[str, Provider],
+    ):
+        super().__init__(query_results, config, providers)
+        columns = config["column"]
+        self.columns: list[str] = [columns] if isinstance(columns, str) else columns
+        referenced_columns = config.get("referenced_column", self.columns)
+        self.referenced_columns: list[str] = (
+            [referenced_columns]
+            if isinstance(referenced_columns, str)
+            else referenced_columns
+        )
+        if len(self.referenced_columns) != len(self.columns):
+            raise ValueError(
+                f"Columns {self.columns} and referenced columns "
+                f"{self.referenced_columns} must have the same length"
+            )
+        self.source = config.get("source", "provider")
+        self.max_exact_keys = int(config.get("max_exact_keys", 1_000_000))
+        self.false_positive_rate = float(config.get("false_positive_rate", 0.001))
+        self.max_reported_keys = int(config.get("max_reported_keys", 100))
+
+    def _referenced_keys(self) -> Iterator[tuple[str, ...]]:
+        rows = (
+            RowLoaderFactory(self.providers)
+            .get_loader(self.source)
+            .iter_rows(self.config)
+        )
+        for row in rows:
+            key = tuple(row[column] for column in self.referenced_columns)
+            if None not in key:
+                # Compared as text, providers may return e.g. Decimal or int for a key
+                yield tuple(map(str, key))
+
+    def _bloom_filter_items(self, exact_keys: int) -> int | None:
+        """Keys to size the Bloom filter for, or None to keep the exact set."""
+        if "expected_keys" in self.config:
+            return max(int(self.config["expected_keys"]), exact_keys)
+        if self.source != "provider":
+            return None
+        # Only counted once the exact set is too large
+        provider = self.providers[self.config["provider"]]
+        rows = provider.execute_query(
+            f"SELECT COUNT(*) AS row_count FROM {as_subquery(self.config['query'])} AS t"
+        )
+        return max(int(next(iter(rows[0].values()))), exact_keys)
+
+    def _run_test(self) -> TestResultCore:
+        exact: set[tuple[str, ...]] = set()
+        bloom: BloomFilter | None = None
+        referenced_keys = self._referenced_keys()
+        for key in referenced_keys:
+            exact.add(key)
+            if len(exact) > self.max_exact_keys:
+                bloom_items = self._bloom_filter_items(len(exact))
+                if bloom_items is None:
+                    exact.update(referenced_keys)
+                else:
+                    bloom = BloomFilter(bloom_items, self.false_positive_rate)
+                    for bloom_key in chain(exact, referenced_keys):
+                        bloom.add(hash_key(bloom_key))
+                    exact = set()
+                break
+        mode = "exact" if bloom is None else "bloom"
+
+        total_keys = 0
+        missing_rows = 0
+        # Reported with the original values of the first rows of each missing key
+        missing_keys: dict[tuple[str, ...], dict[str, Any]] = {}
+        for row in self.query_results:
+            values = [row[column] for column in self.columns]
+            if None in values:
+                continue
+            total_keys += 1
+            key = tuple(map(str, values))
+            if key in exact if bloom is None else hash_key(key) in bloom:
+                continue
+            missing_rows += 1
+            if key in missing_keys:
+                missing_keys[key]["count"] += 1
+            elif len(missing_keys) < self.max_reported_keys:
+                missing_keys[key] = {
+                    "key": dict(zip(self.columns, values)),
+                    "count": 1,
+                }
+
+        passed = not missing_rows
+        message = (
+            f"All {total_keys} keys exist in the referenced rows."
+            if passed
+            else f"Found {missing_rows} rows with keys missing from the referenced rows."
+        )
+        details: dict[str, Any] = {
+            "columns": self.columns,
+            "referenced_columns": self.referenced_columns,
+            "mode": mode,
+            "total_keys": total_keys,
+            "missing_rows": missing_rows,
+            "missing_keys": list(missing_keys.values()),
+        }
+        if bloom is not None:
+            details["referenced_keys"] = bloom.items
+            details["false_positive_rate"] = bloom.false_positive_rate
+
+        return {
+            "passed": passed,
+            "message": message,
+            "details": details,
+        }
+
+
+class BaseColumnStatsTest(DataTest, ABC):
+    """
+    Base for numeric column statistics checks.
+
+    Result columns are converted once into float arrays (nulls become NaN) and
+    every statistic is computed on the arrays instead of looping over the rows.
+    The arrays are kept in the run cache, so all the checks of a test share them.
+    """
+
+    def __init__(
+        self,
+        query_results: Sequence[dict[str, Any]],
+        config: Any,
+        providers: dict[str, Provider],
+    ):
+        if np is None:
+            raise ImportError(
+                "Missing required dependency: 'numpy'.\n"
+                "Install it with: pip install aqueductus[numpy]"
+            )
+        super().__init__(query_results, config, providers)
+
+    def _column_array(self, column: str) -> Any:
+        arrays = self.run_cache.setdefault("column_arrays", {})
+        if column not in arrays:
+            values = list(map(itemgetter(column), self.query_results))
+            try:
+                arrays[column] = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Column '{column}' is not numeric: {e}") from e
+        return arrays[column]
+
+    @staticmethod
+    def _non_null(array: Any) -> Any:
+        return array[~np.isnan(array)]
+
+    @staticmethod
+    def _within_bounds(actual: float, config: dict[str, Any]) -> bool:
+        if np.isnan(actual):
+            return False
+        if "min" in config and actual < float(config["min"]):
+            return False
+        if "max" in config and actual > float(config["max"]):
+            return False
+        return True
+
+    @abstractmethod
+    def _evaluate(self, array: Any, config: dict[str, Any]) -> dict[str, Any]:
+        pass
+
+    def _run_test(self) -> TestResultCore:
+        configs = self.config if isinstance(self.config, list) else [self.config]
+        results = []
+        for config in configs:
+            array = self._column_array(config["column"])
+            results.append(
+                {"column": config["column"], **self._evaluate(array, config)}
+            )
+
+        passed = all(result["passed"] for result in results)
+        message = (
+            f"All {self.test_name} checks passed."
+            if passed
+            else f"Some {self.test_name} checks are outside expected bounds."
+        )
+        details = {
+            "total_rows": len(self.query_results),
+            "results": results,
+        }
+
+        return {
+            "passed": passed,
+            "message": message,
+            "details": details,
+        }
+
+
+class BaseColumnStatisticTest(BaseColumnStatsTest, ABC):
+    """Checks that a single statistic of the non-null values is within min/max."""
+
+    @abstractmethod
+    def _statistic(self, values: Any, config: dict[str, Any]) -> float:
+        pass
+
+    def _evaluate(self, array: Any, config: dict[str, Any]) -> dict[str, Any]:
+        values = self._non_null(array)
+        actual = float(self._statistic(values, config)) if values.size else np.nan
+        return {
+            "passed": self._within_bounds(actual, config),
+            "actual": None if np.isnan(actual) else actual,
+            "min": config.get("min"),
+            "max": config.get("max"),
+        }
+
+
+class ColumnRangeTest(BaseColumnStatsTest):
+    test_name = "column_range"
+
+    def _evaluate(self, array: Any, config: dict[str, Any]) -> dict[str, Any]:
+        values = self._non_null(array)
+        out_of_range = np.zeros(values.shape, dtype=bool)
+        if "min" in config:
+            out_of_range |= values < float(config["min"])
+        if "max" in config:
+            out_of_range |= values > float(config["max"])
+        out_of_range_rows = int(np.count_nonzero(out_of_range))
+        return {
+            "passed": out_of_range_rows == 0,
+            "out_of_range_rows": out_of_range_rows,
+            "actual_min": float(values.min()) if values.size else None,
+            "actual_max": float(values.max()) if values.size else None,
+            "min": config.get("min"),
+            "max": config.get("max"),
+        }
+
+
+class ColumnNullRatioTest(BaseColumnStatsTest):
+    test_name = "column_null_ratio"
+
+    def _evaluate(self, array: Any, config: dict[str, Any]) -> dict[str, Any]:
+        min_ratio = float(config.get("min_ratio", 0.0))
+        max_ratio = float(config.get("max_ratio", 1.0))
+        null_rows = int(np.count_nonzero(np.isnan(array)))
+        actual_ratio = null_rows / array.size if array.size else 0.0
+        return {
+            "passed": min_ratio <= actual_ratio <= max_ratio,
+            "actual_ratio": actual_ratio,
+            "min_ratio": min_ratio,
+            "max_ratio": max_ratio,
+            "null_rows": null_rows,
+        }
+
+
+class ColumnMinTest(BaseColumnStatisticTest):
+    test_name = "column_min"
+
+    def _statistic(self, values: Any, config: dict[str, Any]) -> float:
+        return values.min()
+
+
+class ColumnMaxTest(BaseColumnStatisticTest):
+    test_name = "column_max"
+
+    def _statistic(self, values: Any, config: dict[str, Any]) -> float:
+        return values.max()
+
+
+class ColumnMeanTest(BaseColumnStatisticTest):
+    test_name = "column_mean"
+
+    def _statistic(self, values: Any, config: dict[str, Any]) -> float:
+        return values.mean()
+
+
+class ColumnStddevTest(BaseColumnStatisticTest):
+    test_name = "column_stddev"
+
+    def _statistic(self, values: Any, config: dict[str, Any]) -> float:
+        # Sample standard deviation by default, like SQL STDDEV
+        return values.std(ddof=config.get("ddof", 1 if values.size > 1 else 0))
+
+
+class ColumnPercentileTest(BaseColumnStatisticTest):
+    test_name = "column_percentile"
+
+    def _statistic(self, values: Any, config: dict[str, Any]) -> float:
+        return np.percentile(values, float(config["percentile"]))
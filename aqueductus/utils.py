@@ -1,6 +1,14 @@
+import heapq
 import importlib.util
+import pickle
+import tempfile
 from pathlib import Path
 from types import ModuleType
+from typing import IO, Any, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_SPILL_BLOCK_SIZE = 1_000
 
 
 def load_module(file: str) -> ModuleType | None:
@@ -13,3 +21,67 @@ def load_module(file: str) -> ModuleType | None:
         spec.loader.exec_module(module)  # type: ignore[union-attr]
         return module
     return None
+
+
+def as_subquery(query: str) -> str:
+    """Wrap a query to be used in the FROM clause of another one."""
+    return f"(\n{query.strip().rstrip(';').strip()}\n)"
+
+
+def sql_literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+def external_sort(
+    items: Iterable[T], key: Callable[[T], Any], max_items_in_memory: int
+) -> Iterator[T]:
+    """
+    Sort `items` keeping at most `max_items_in_memory` of them in memory.
+
+    Items are sorted in chunks that are spilled to temporary files, then the sorted
+    chunks are lazily merged.
+    """
+    chunks: list[IO[bytes]] = []
+    chunk: list[T] = []
+    try:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= max_items_in_memory:
+                chunks.append(_spill(sorted(chunk, key=key)))
+                chunk = []
+        chunk.sort(key=key)
+        if not chunks:
+            yield from chunk
+            return
+        if chunk:
+            chunks.append(_spill(chunk))
+            chunk = []
+        yield from heapq.merge(*(_read_spilled(f) for f in chunks), key=key)
+    finally:
+        for f in chunks:
+            f.close()
+
+
+def _spill(items: list[Any]) -> IO[bytes]:
+    # Items are pickled in blocks, loading them one by one is much slower
+    f = tempfile.TemporaryFile()
+    for start in range(0, len(items), _SPILL_BLOCK_SIZE):
+        block = items[start : start + _SPILL_BLOCK_SIZE]
+        pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+    f.seek(0)
+    return f
+
+
+def _read_spilled(f: IO[bytes]) -> Iterator[Any]:
+    while True:
+        try:
+            yield from pickle.load(f)
+        except EOFError:
+            return
@@ -0,0 +1,34 @@
+import sqlite3
+
+import pytest
+
+from aqueductus.runner import TestRunner
+
+
+@pytest.fixture
+def write_items(tmp_path, monkeypatch):
+    """Replace the `items` table of `data.sqlite`, in the test's working directory."""
+    monkeypatch.chdir(tmp_path)
+
+    def write(rows, columns="id INTEGER"):
+        conn = sqlite3.connect(tmp_path / "data.sqlite")
+        conn.execute("DROP TABLE IF EXISTS items")
+        conn.execute(f"CREATE TABLE items ({columns})")
+        placeholders = ", ".join("?" for _ in columns.split(","))
+        conn.executemany(f"INSERT INTO items VALUES ({placeholders})", rows)
+        conn.commit()
+        conn.close()
+
+    return write
+
+
+@pytest.fixture
+def make_runner(tmp_path, write_items):
+    """Write `config.yml` and the `items` rows, then build a runner reading them."""
+
+    def make(config, rows, columns="id INTEGER", runner_class=TestRunner, **kwargs):
+        write_items(rows, columns)
+        (tmp_path / "config.yml").write_text(config)
+        return runner_class(["config.yml"], **kwargs)
+
+    return make
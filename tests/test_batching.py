@@ -0,0 +1,105 @@
+from aqueductus import runner
+
+CONFIG = """
+providers:
+  - name: db
+    type: sqlite
+    config:
+      database_path: data.sqlite
+  - name: other
+    type: sqlite
+    config:
+      database_path: data.sqlite
+tests:
+  - name: all_items
+    provider: db
+    query: SELECT * FROM items
+    row_count: 3
+  - name: big_items
+    provider: db
+    query: SELECT * FROM items WHERE size > 1;
+    row_count: 2
+  - name: other_items
+    provider: other
+    query: SELECT * FROM items
+    row_count: 3
+  - name: with_timeout
+    provider: db
+    query: SELECT * FROM items
+    timeout: 10
+    row_count: 3
+  - name: with_rows
+    provider: db
+    query: SELECT * FROM items
+    row_count: 3
+    contains_rows:
+      source: inline
+      rows:
+        - id: 1
+  - name: upper_case_columns
+    provider: db
+    query: SELECT id AS ID FROM items
+    row_count: 3
+    columns_exists:
+      - id
+"""
+
+
+ITEMS = [(1, 1), (2, 2), (3, 3)]
+
+
+def _runner(make_runner, config=CONFIG, batch_size=5):
+    return make_runner(config, ITEMS, "id INTEGER, size INTEGER", batch_size=batch_size)
+
+
+def test_build_batch_query():
+    query, aliases = runner.build_batch_query(
+        ["SELECT * FROM a;", "SELECT * FROM b"], [["COUNT(*)"], ["COUNT(*)", "MAX(x)"]]
+    )
+
+    assert aliases == [["b0_0"], ["b1_0", "b1_1"]]
+    assert query == (
+        "SELECT * FROM (SELECT COUNT(*) AS b0_0 FROM (\nSELECT * FROM a\n) AS t0) AS s0"
+        "\nCROSS JOIN (SELECT COUNT(*) AS b1_0, MAX(x) AS b1_1 "
+        "FROM (\nSELECT * FROM b\n) AS t1) AS s1"
+    )
+
+
+def test_find_batches_groups_aggregate_only_tests_by_provider(make_runner):
+    tester = _runner(make_runner)
+
+    batches = [[test.name for test in batch] for batch in tester._find_batches()]
+
+    # Tests with a timeout, row checks or another provider are left out
+    assert batches == [["all_items", "big_items"]]
+    tester.batch_size = 1
+    assert tester._find_batches() == []
+
+
+def test_batched_results_match_individual_runs(make_runner):
+    batched = _runner(make_runner).run_all()
+    individual = _runner(make_runner, batch_size=0).run_all()
+
+    for batched_test, test in zip(batched, individual):
+        assert batched_test.passed == test.passed, test.name
+    assert not batched[-1].passed
+    assert batched[0].results[0]["details"]["batch"] == {
+        "tests": ["all_items", "big_items"]
+    }
+    assert batched[1].results[0]["details"]["actual_count"] == 2
+
+
+def test_failed_batch_runs_the_tests_alone(make_runner):
+    # PRAGMA statements can't be used as subqueries
+    config = CONFIG.split("  - name: other_items")[0] + (
+        "  - name: pragma\n"
+        "    provider: db\n"
+        "    query: PRAGMA table_info(items)\n"
+        "    row_count: 2\n"
+    )
+    tests = _runner(make_runner, config).run_all()
+
+    assert [test.passed for test in tests] == [True, True, True]
+    batch = tests[0].results[0]["details"]["batch"]
+    assert batch["tests"] == ["all_items", "big_items", "pragma"]
+    assert "error" in batch
@@ -0,0 +1,116 @@
+import os
+
+from aqueductus.daemon import Daemon
+
+CONFIG = """
+providers:
+  - name: db
+    type: sqlite
+    config:
+      database_path: data.sqlite
+tests:
+  - name: low
+    provider: db
+    query: SELECT * FROM items
+    interval: 100
+    row_count: 2
+  - name: high
+    provider: db
+    query: SELECT * FROM items
+    interval: 10
+    priority: 5
+    row_count: 2
+  - name: failing
+    provider: db
+    query: SELECT * FROM items
+    interval: 50
+    row_count: 3
+"""
+
+
+def _daemon(make_runner) -> Daemon:
+    return make_runner(
+        CONFIG,
+        [(1,), (2,)],
+        runner_class=Daemon,
+        default_interval=300,
+        metrics_path="metrics.prom",
+    )
+
+
+def test_runs_due_tests_by_priority_then_schedules_by_interval(
+    make_runner, monkeypatch
+):
+    daemon = _daemon(make_runner)
+    ran = []
+    monkeypatch.setattr(daemon, "_run_test", lambda test: ran.append(test.name))
+
+    daemon.run_pending()
+
+    assert ran == ["high", "low", "failing"]
+    next_runs = [entry[3].name for entry in sorted(daemon._queue)]
+    assert next_runs == ["high", "failing", "low"]
+
+
+def test_writes_prometheus_metrics(make_runner, tmp_path):
+    daemon = _daemon(make_runner)
+
+    daemon.run_pending()
+
+    metrics = (tmp_path / "metrics.prom").read_text().splitlines()
+    assert "# TYPE aqueductus_test_runs_total counter" in metrics
+    assert 'aqueductus_test_passed{test="high"} 1' in metrics
+    assert 'aqueductus_test_passed{test="failing"} 0' in metrics
+    assert 'aqueductus_test_failures_total{test="failing"} 1' in metrics
+    assert 'aqueductus_check_passed{test="low",check="row_count"} 1' in metrics
+
+
+def test_reloads_changed_config(make_runner, tmp_path):
+    daemon = _daemon(make_runner)
+    config = tmp_path / "config.yml"
+    config.write_text(CONFIG.split("  - name: failing")[0])
+    os.utime(config, (0, 0))
+
+    daemon._reload_if_changed()
+
+    assert [test.name for test in daemon.runner.tests] == ["low", "high"]
+
+    # Invalid configs keep the previous tests running
+    config.write_text("tests: [")
+    os.utime(config, (1, 1))
+    daemon._reload_if_changed()
+
+    assert [test.name for test in daemon.runner.tests] == ["low", "high"]
+
+
+def test_reconnects_dropped_connections(make_runner):
+    daemon = _daemon(make_runner)
+    old_provider = daemon.runner.providers["db"]
+    old_provider.conn.close()
+
+    test = daemon.runner.tests[0]
+    daemon._run_test(test)
+
+    assert test.passed
+    assert test.provider is not old_provider
+    assert daemon.runner.providers["db"] is test.provider
+
+
+def test_only_checks_the_providers_of_the_failing_test(make_runner, monkeypatch):
+    daemon = _daemon(make_runner)
+    daemon.runner.config["providers"].append({"name": "other"})
+    daemon.runner.providers["other"] = daemon.runner._create_provider(
+        {"name": "other", "type": "sqlite", "config": {"database_path": ":memory:"}}
+    )
+    pings = []
+    for name, provider in daemon.runner.providers.items():
+        monkeypatch.setattr(
+            provider, "is_connected", lambda name=name: pings.append(name) or True
+        )
+    test = daemon.runner.tests[0]
+    test.query = "SELECT * FROM missing"
+
+    daemon._run_test(test)
+
+    assert test.results[0]["name"] == "error"
+    assert pings == ["db"]
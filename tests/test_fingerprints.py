@@ -0,0 +1,88 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from aqueductus.state import StateFile
+
+CONFIG = """
+providers:
+  - name: db
+    type: sqlite
+    config:
+      database_path: data.sqlite
+tests:
+  - name: items
+    provider: db
+    query: SELECT * FROM items
+    fingerprint: true
+    row_count: 2
+"""
+
+
+class _Counters(StateFile):
+    file_name = "counters.json"
+
+
+ITEMS = [(1,), (2,)]
+
+
+def test_unchanged_results_skip_the_checks(make_runner):
+    first = make_runner(CONFIG, ITEMS).run_all()[0]
+    second = make_runner(CONFIG, ITEMS).run_all()[0]
+
+    assert [result["name"] for result in first.results] == ["row_count"]
+    assert [result["name"] for result in second.results] == ["fingerprint"]
+    assert second.results[0]["details"]["skipped_checks"] == ["row_count"]
+
+    third = make_runner(CONFIG, [(1,), (3,)]).run_all()[0]
+
+    assert [result["name"] for result in third.results] == ["row_count"]
+
+
+def test_data_changed_during_the_run_is_not_recorded(
+    make_runner, write_items, monkeypatch
+):
+    tester = make_runner(CONFIG, ITEMS)
+    test = tester.tests[0]
+    run_query_checks = test._run_query_checks
+
+    def run_then_change():
+        run_query_checks()
+        write_items([(1,), (3,)])
+
+    monkeypatch.setattr(test, "_run_query_checks", run_then_change)
+    tester.run_all()
+
+    assert test.passed
+    assert "items" not in tester.fingerprints.data
+
+
+def test_checks_reading_external_rows_refuse_fingerprints(make_runner):
+    external = CONFIG + "    contains_rows:\n      source: csv\n      path: a.csv\n"
+
+    with pytest.raises(ValueError, match="contains_rows"):
+        make_runner(external, ITEMS)
+
+    inline = CONFIG + (
+        "    contains_rows:\n"
+        "      source: inline\n"
+        "      rows:\n"
+        "        - id: 1\n"
+    )
+    assert make_runner(inline, ITEMS).run_all()[0].passed
+
+
+def _save_counters(path, worker):
+    for i in range(20):
+        counters = _Counters(path)
+        counters.set(f"{worker}-{i}", i)
+        counters.save()
+
+
+def test_concurrent_saves_keep_every_update(tmp_path):
+    path = tmp_path / "counters.json"
+
+    with ProcessPoolExecutor(4) as pool:
+        list(pool.map(_save_counters, [path] * 4, range(4)))
+
+    assert len(_Counters(path).data) == 80
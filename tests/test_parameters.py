@@ -0,0 +1,85 @@
+from aqueductus import runner
+
+CONFIG = """
+providers:
+  - name: db
+    type: sqlite
+    config:
+      database_path: data.sqlite
+tests:
+  - name: items
+    provider: db
+    query: SELECT * FROM items
+    parameters:
+      active:
+        column: active
+        values: [true, false]
+      price:
+        column: price
+        values: [3, 4]
+    row_count: <<price>>
+  - name: cheap_items
+    provider: db
+    query: SELECT * FROM items WHERE price < <<limit>>
+    parameters:
+      limit: [4, 5]
+    row_count: 6
+"""
+
+
+def _runner(make_runner):
+    # Booleans are stored as integers and prices as floats
+    rows = [(1, 1, 3.0)] * 3 + [(2, 1, 4.0)] * 4 + [(3, 0, 3.0)] * 3
+    return make_runner(CONFIG, rows, "id INTEGER, active INTEGER, price REAL")
+
+
+def test_expands_one_test_per_combination(make_runner):
+    tester = _runner(make_runner)
+
+    assert [test.name for test in tester.tests] == [
+        "items[active=True, price=3]",
+        "items[active=True, price=4]",
+        "items[active=False, price=3]",
+        "items[active=False, price=4]",
+        "cheap_items[limit=4]",
+        "cheap_items[limit=5]",
+    ]
+    assert tester.tests[1].query == (
+        "SELECT * FROM (\nSELECT * FROM items\n) AS t "
+        "WHERE t.active = TRUE AND t.price = 4"
+    )
+    assert tester.tests[1].test_configs == {"row_count": 4}
+    # Parameters used in the query can't share a grouped query
+    assert tester.tests[4].query == "SELECT * FROM items WHERE price < 4"
+    assert tester.tests[4].parameter_group is None
+
+
+def test_grouped_query_routes_rows_with_database_comparisons(make_runner, monkeypatch):
+    tester = _runner(make_runner)
+    provider = tester.providers["db"]
+    queries = []
+    stream_query = provider.stream_query
+
+    def spy_stream_query(query):
+        queries.append(query)
+        return stream_query(query)
+
+    monkeypatch.setattr(provider, "stream_query", spy_stream_query)
+
+    tests = tester.run_all()
+
+    assert len(queries) == 1
+    assert [test.rows_scanned for test in tests[:4]] == [3, 4, 3, 0]
+    assert [test.passed for test in tests] == [True, True, True, False, True, False]
+    # The routing column isn't part of the rows
+    assert queries[0].count(runner.ParameterGroup.INDEX_COLUMN) == 1
+
+
+def test_sub_tests_with_the_same_values_share_their_rows(make_runner):
+    tester = _runner(make_runner)
+    group = runner.ParameterGroup(tester.providers["db"], "SELECT * FROM items", ["id"])
+
+    assert [group.add([1]), group.add([2]), group.add([1])] == [0, 1, 0]
+    assert len(group.rows_for(0)) == 3
+    assert len(group.rows_for(1)) == 4
+    assert all("id" in row and len(row) == 3 for row in group.rows_for(0))
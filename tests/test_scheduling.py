@@ -0,0 +1,241 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from aqueductus import runner
+from aqueductus.__main__ import main
+from aqueductus.scheduling import (
+    check_shards,
+    estimate_durations,
+    format_plan,
+    parse_shard,
+    partition,
+    shard_manifest,
+)
+from aqueductus.state import DurationHistory
+
+CONFIG = """
+providers:
+  - name: db
+    type: sqlite
+    config:
+      database_path: ":memory:"
+tests:
+"""
+
+
+def _write_config(tmp_path, names, file_name="config.yml"):
+    config = tmp_path / file_name
+    config.write_text(
+        CONFIG
+        + "".join(
+            f"  - name: {name}\n    provider: db\n    query: SELECT 1 AS one\n"
+            f"    row_count: 1\n"
+            for name in names
+        )
+    )
+    return str(config)
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    assert parse_shard(" 1 / 1 ") == (1, 1)
+    for value in ["0/2", "3/2", "1/0", "1", "a/b"]:
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_partition_balances_durations():
+    names = ["a", "b", "c", "d", "e"]
+    buckets = partition(names, [10, 6, 5, 3, 1], 2)
+
+    assert buckets == [[0, 3], [1, 2, 4]]
+    # Ties are broken by name, so the result doesn't depend on the input order
+    assert partition(["b", "a"], [1, 1], 2) == [[1], [0]]
+
+
+def test_estimate_durations_converts_costs_per_provider():
+    estimates = estimate_durations(
+        [2.0, None, None, None],
+        [10.0, 30.0, None, 5.0],
+        ["pg", "pg", "pg", "mysql"],
+    )
+
+    assert estimates == [
+        (2.0, "history"),
+        (6.0, "explain"),
+        (2.0, "default"),
+        # No duration of that provider yet, the cost is scaled around the default
+        (2.0, "explain"),
+    ]
+
+
+def test_unparsable_costs_fall_back_to_the_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = _write_config(tmp_path, ["a", "b", "c"])
+    history = DurationHistory(tmp_path / "history.json")
+    history.record("a", 3.0)
+    history.save()
+    tester = runner.TestRunner([config], history_path="history.json")
+    # The plan of the second query can't be parsed
+    costs = iter([1.0, KeyError("Plan"), 4.0])
+
+    def estimate_cost(query):
+        cost = next(costs)
+        if isinstance(cost, Exception):
+            raise cost
+        return cost
+
+    monkeypatch.setattr(tester.providers["db"], "estimate_cost", estimate_cost)
+
+    assert tester.estimate_durations() == [
+        (3.0, "history"),
+        (3.0, "default"),
+        (12.0, "explain"),
+    ]
+
+
+def test_plan_balances_the_workers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = _write_config(tmp_path, ["a", "b", "c"])
+    history = DurationHistory(tmp_path / "history.json")
+    for name, duration in {"a": 4.0, "b": 3.0, "c": 2.0}.items():
+        history.record(name, duration)
+    history.save()
+    tester = runner.TestRunner([config], history_path="history.json")
+
+    buckets = tester.plan(2)
+
+    assert buckets == [
+        [(0, 4.0, "history")],
+        [(1, 3.0, "history"), (2, 2.0, "history")],
+    ]
+    assert format_plan(
+        [[(tester.tests[i].name, s, source) for i, s, source in b] for b in buckets]
+    ).splitlines() == [
+        "Worker 1 (estimated 4.00s):",
+        "        4.00s  a [history]",
+        "Worker 2 (estimated 5.00s):",
+        "        3.00s  b [history]",
+        "        2.00s  c [history]",
+        "Estimated critical path: 5.00s (worker 2)",
+    ]
+    assert format_plan([]) == ""
+
+
+def test_check_shards_detects_missing_and_duplicated_tests():
+    manifest = {"count": 2, "tests": ["a", "b", "c"], "inputs": "x"}
+    shard_1 = {**manifest, "index": 1}
+    shard_2 = {**manifest, "index": 2}
+
+    assert check_shards([shard_1, shard_2], ["a", "b", "c"]) == []
+    assert check_shards([shard_1, shard_2], ["a", "b"]) == ["Test 'c' is missing"]
+    assert check_shards([shard_1], ["a", "b"]) == [
+        "Shard 2/2 is missing",
+        "Test 'c' is missing",
+    ]
+    assert check_shards([None, None], ["a", "a"]) == ["Test 'a' is in several reports"]
+
+
+def test_shards_with_different_histories_are_not_merged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = _write_config(tmp_path, ["a", "b", "c", "d"])
+    history = DurationHistory(tmp_path / "history.json")
+    for name, duration in {"a": 10, "b": 1, "c": 1, "d": 1}.items():
+        history.record(name, duration)
+    history.save()
+
+    # The first runner knows the durations, the second one doesn't
+    shard_1 = runner.TestRunner([config], shard=(1, 2), history_path="history.json")
+    shard_2 = runner.TestRunner([config], shard=(2, 2), history_path="missing.json")
+    names = [test.name for tester in (shard_1, shard_2) for test in tester.tests]
+
+    assert sorted(names) != ["a", "b", "c", "d"]
+    assert check_shards([shard_1.shard_manifest, shard_2.shard_manifest], names)
+
+
+def test_merge_combines_shard_reports(tmp_path, monkeypatch):
+    config = _write_config(tmp_path, ["a", "b", "c", "d"])
+    cache = tmp_path / "cache.json"
+    cli = CliRunner()
+    for _ in range(2):
+        for index in (1, 2):
+            # Like separate CI runners restoring the same cached history
+            runner_dir = tmp_path / f"runner-{index}"
+            runner_dir.mkdir(exist_ok=True)
+            monkeypatch.chdir(runner_dir)
+            if cache.exists():
+                shutil.copy(cache, "history.json")
+            history = DurationHistory("history.json").data
+            result = cli.invoke(
+                main,
+                [config, "--shard", f"{index}/2", "--history", "history.json"]
+                + ["-f", "json"],
+            )
+            assert result.exit_code == 0
+            # Shards leave the history to merge
+            assert DurationHistory("history.json").data == history
+            os.replace("report.json", tmp_path / f"report-{index}.json")
+
+        monkeypatch.chdir(tmp_path)
+        result = cli.invoke(
+            main,
+            ["merge", "report-1.json", "report-2.json", "--history", "cache.json"]
+            + ["-f", "json"],
+        )
+        assert result.exit_code == 0, result.output
+        with open(tmp_path / "report.json") as f:
+            merged = json.load(f)
+        assert sorted(merged[0]) == ["a", "b", "c", "d"]
+        assert sorted(DurationHistory(cache).data) == ["a", "b", "c", "d"]
+
+    result = cli.invoke(main, ["merge", "report-1.json", "-f", "json"])
+    assert result.exit_code == 1
+    assert "Shard 2/2 is missing" in result.output
+
+
+def test_shards_of_several_config_files_merge_across_processes(tmp_path):
+    for group in ["a", "b", "c"]:
+        _write_config(tmp_path, [f"{group}1", f"{group}2"], f"{group}.yml")
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(Path(__file__).parents[1]),
+    }
+    for index in (1, 2):
+        # Each runner has its own hash seed, like processes on separate machines
+        subprocess.run(
+            [sys.executable, "-m", "aqueductus", "*.yml"]
+            + ["--shard", f"{index}/2", "-f", "json"],
+            cwd=tmp_path,
+            env={**env, "PYTHONHASHSEED": str(index)},
+            check=True,
+            capture_output=True,
+        )
+        (tmp_path / "report.json").rename(tmp_path / f"report-{index}.json")
+
+    result = subprocess.run(
+        [sys.executable, "-m", "aqueductus", "merge", "report-1.json"]
+        + ["report-2.json", "-f", "json"],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    with open(tmp_path / "report.json") as f:
+        merged = json.load(f)
+    assert sorted(merged[0]) == ["a1", "a2", "b1", "b2", "c1", "c2"]
+
+
+def test_shard_manifest_does_not_depend_on_the_test_order():
+    manifest = shard_manifest(1, 2, ["a", "b", "c"], [1.0, 2.0, 3.0])
+
+    assert shard_manifest(1, 2, ["c", "a", "b"], [3.0, 1.0, 2.0]) == manifest
+    assert manifest["tests"] == ["a", "b", "c"]
@@ -0,0 +1,21 @@
+from aqueductus.sketches import BloomFilter, HyperLogLog, hash_key
+
+
+def test_hyperloglog_estimate_is_within_error():
+    sketch = HyperLogLog(precision=12)
+    for i in range(50_000):
+        sketch.add(hash_key((i,)))
+        # Repeated keys don't change the estimate
+        sketch.add(hash_key((i,)))
+
+    assert abs(sketch.estimate() - 50_000) <= 50_000 * 3 * sketch.standard_error
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(10_000, false_positive_rate=0.01)
+    for i in range(10_000):
+        bloom.add(hash_key((i,)))
+
+    assert all(hash_key((i,)) in bloom for i in range(10_000))
+    false_positives = sum(hash_key((i,)) in bloom for i in range(10_000, 20_000))
+    assert false_positives < 300
@@ -0,0 +1,261 @@
+import gc
+import weakref
+
+import pytest
+
+from aqueductus.providers import SQLiteProvider
+from aqueductus.testers import TestFactory
+
+ROWS = [{"price": price} for price in [10, 20, 30, 40, None]]
+
+
+def _run(test_type, config, rows=ROWS, **kwargs):
+    return TestFactory.create_test(test_type, config, rows, {}, **kwargs).run()
+
+
+@pytest.mark.parametrize(
+    "test_type, config, passed, actual",
+    [
+        ("column_min", {"column": "price", "min": 10}, True, 10.0),
+        ("column_min", {"column": "price", "min": 11}, False, 10.0),
+        ("column_max", {"column": "price", "max": 40}, True, 40.0),
+        ("column_max", {"column": "price", "max": 39}, False, 40.0),
+        ("column_mean", {"column": "price", "min": 25, "max": 25}, True, 25.0),
+        ("column_stddev", {"column": "price", "max": 13}, True, 12.909944),
+        ("column_stddev", {"column": "price", "ddof": 0, "max": 11.2}, True, 11.18034),
+        (
+            "column_percentile",
+            {"column": "price", "percentile": 50, "max": 25},
+            True,
+            25.0,
+        ),
+        (
+            "column_percentile",
+            {"column": "price", "percentile": 100, "max": 25},
+            False,
+            40.0,
+        ),
+    ],
+)
+def test_column_statistics(test_type, config, passed, actual):
+    result = _run(test_type, [config])
+
+    assert result["passed"] is passed
+    assert result["details"]["results"][0]["actual"] == pytest.approx(actual)
+
+
+def test_column_range():
+    result = _run("column_range", {"column": "price", "min": 15, "max": 35})
+
+    assert not result["passed"]
+    assert result["details"]["results"][0]["out_of_range_rows"] == 2
+    assert _run("column_range", {"column": "price", "min": 10, "max": 40})["passed"]
+
+
+def test_column_null_ratio():
+    result = _run("column_null_ratio", {"column": "price", "max_ratio": 0.1})
+
+    assert not result["passed"]
+    assert result["details"]["results"][0]["actual_ratio"] == 0.2
+    assert _run("column_null_ratio", {"column": "price", "max_ratio": 0.2})["passed"]
+
+
+def test_column_statistics_without_values_fail():
+    result = _run("column_mean", {"column": "price", "min": 0}, rows=[{"price": None}])
+
+    assert not result["passed"]
+    assert result["details"]["results"][0]["actual"] is None
+
+
+def test_column_statistics_reject_non_numeric_columns():
+    with pytest.raises(ValueError, match="not numeric"):
+        _run("column_max", {"column": "name", "max": 1}, rows=[{"name": "a"}])
+
+
+def test_column_arrays_are_shared_by_the_run_only():
+    class Rows(list):
+        # Plain lists can't be weakly referenced
+        pass
+
+    rows = Rows(ROWS)
+    rows_ref = weakref.ref(rows)
+    run_cache: dict = {}
+    _run("column_min", {"column": "price"}, rows=rows, run_cache=run_cache)
+    array = run_cache["column_arrays"]["price"]
+    _run("column_max", {"column": "price"}, rows=rows, run_cache=run_cache)
+
+    # The second check reused the array converted by the first one
+    assert run_cache["column_arrays"]["price"] is array
+
+    del rows, run_cache, array
+    gc.collect()
+    assert rows_ref() is None
+
+
+def test_all_rows_match_merge_join():
+    expected = [{"id": i, "status": "ok"} for i in range(50)]
+    actual = [{"id": i, "status": "ok"} for i in reversed(range(50))]
+    actual[10] = {"id": 39, "status": "late"}
+    config = {
+        "source": "inline",
+        "rows": expected,
+        "key_columns": ["id"],
+        # Spill both sides to exercise the external merge sort
+        "max_rows_in_memory": 8,
+    }
+
+    result = _run("all_rows_match", config, rows=actual)
+
+    assert not result["passed"]
+    assert result["details"]["non_matching_count"] == 1
+    assert result["details"]["non_matching_rows"] == [{"id": 39, "status": "late"}]
+
+    actual[10] = {"id": 39, "status": "ok"}
+    assert _run("all_rows_match", config, rows=actual)["passed"]
+
+
+def test_all_rows_match_presorted_rejects_unsorted_rows():
+    config = {
+        "source": "inline",
+        "rows": [{"id": 1}, {"id": 2}],
+        "key_columns": ["id"],
+        "presorted": True,
+    }
+
+    with pytest.raises(ValueError, match="not sorted"):
+        _run("all_rows_match", config, rows=[{"id": 2}, {"id": 1}])
+
+
+def test_all_rows_match_presorted_sorts_text_keys():
+    # Ordered like a case-insensitive collation, not like Python strings
+    names = ["apple", "Banana", "cherry", "Date"]
+    config = {
+        "source": "inline",
+        "rows": [{"name": name} for name in names],
+        "key_columns": ["name"],
+        "presorted": True,
+    }
+
+    result = _run("all_rows_match", config, rows=[{"name": name} for name in names])
+
+    assert result["passed"]
+    assert result["details"]["total_actual"] == 4
+
+
+def test_all_rows_match_presorted_streams_from_the_same_provider(tmp_path):
+    provider = SQLiteProvider({"database_path": str(tmp_path / "data.sqlite")})
+    provider.conn.execute("CREATE TABLE actual (id INTEGER, status TEXT)")
+    provider.conn.execute("CREATE TABLE expected (id INTEGER, status TEXT)")
+    rows = [(i, "ok") for i in range(25_000)]
+    provider.conn.executemany("INSERT INTO actual VALUES (?, ?)", rows)
+    provider.conn.executemany("INSERT INTO expected VALUES (?, ?)", rows[:-1])
+    config = {
+        "source": "provider",
+        "provider": "db",
+        "query": "SELECT * FROM expected ORDER BY id",
+        "key_columns": ["id"],
+        "presorted": True,
+    }
+
+    # Both streams are read alternately, in batches, from the same provider
+    actual = provider.stream_query("SELECT * FROM actual ORDER BY id")
+    result = TestFactory.create_test(
+        "all_rows_match", config, actual, {"db": provider}
+    ).run()
+
+    assert result["details"]["total_actual"] == 25_000
+    assert result["details"]["non_matching_rows"] == [{"id": 24_999, "status": "ok"}]
+
+
+def test_unique_columns_reports_duplicated_keys():
+    rows = [{"id": 1}, {"id": 2}, {"id": 2}, {"id": None}, {"id": None}]
+    result = _run("unique_columns", ["id"], rows=rows)
+
+    assert not result["passed"]
+    assert result["details"]["duplicate_rows"] == 1
+    assert result["details"]["duplicated_keys"] == [{"key": {"id": 2}, "count": 2}]
+
+
+def test_unique_columns_multi_column_keys():
+    rows = [
+        {"region": "eu", "day": 1, "total": 10},
+        {"region": "eu", "day": 2, "total": 10},
+        {"region": "us", "day": 1, "total": 10},
+        {"region": "eu", "day": None, "total": 10},
+        {"region": "eu", "day": None, "total": 10},
+    ]
+    config = {"columns": ["region", "day"]}
+
+    # Keys with a null value are ignored
+    assert _run("unique_columns", config, rows=rows)["passed"]
+
+    result = _run("unique_columns", config, rows=rows + [rows[1]])
+    assert not result["passed"]
+    assert result["details"]["distinct_keys"] == 3
+    assert result["details"]["duplicated_keys"] == [
+        {"key": {"region": "eu", "day": 2}, "count": 2}
+    ]
+
+
+def test_unique_columns_approximate_mode():
+    rows = [{"id": i} for i in range(10_000)]
+    config = {"columns": "id", "mode": "approximate"}
+
+    assert _run("unique_columns", config, rows=rows)["passed"]
+
+    rows += [{"id": i} for i in range(2_000)]
+    assert not _run("unique_columns", config, rows=rows)["passed"]
+
+
+def test_references_reports_missing_keys():
+    rows = [{"product_id": 1}, {"product_id": 3}, {"product_id": None}]
+    referenced = [{"id": 1}, {"id": 2}]
+    for max_exact_keys, mode in [(1_000, "exact"), (0, "bloom")]:
+        config = {
+            "column": "product_id",
+            "referenced_column": "id",
+            "source": "inline",
+            "rows": referenced,
+            "expected_keys": len(referenced),
+            "max_exact_keys": max_exact_keys,
+        }
+        result = _run("references", config, rows=rows)
+
+        assert not result["passed"]
+        assert result["details"]["mode"] == mode
+        assert result["details"]["missing_keys"] == [
+            {"key": {"product_id": 3}, "count": 1}
+        ]
+
+
+def test_references_only_counts_keys_past_the_exact_limit(tmp_path, monkeypatch):
+    provider = SQLiteProvider({"database_path": str(tmp_path / "data.sqlite")})
+    provider.conn.execute("CREATE TABLE products (id INTEGER)")
+    provider.conn.executemany("INSERT INTO products VALUES (?)", [(1,), (2,), (3,)])
+    queries = []
+    execute_query = provider.execute_query
+
+    def spy_execute_query(query):
+        queries.append(query)
+        return execute_query(query)
+
+    monkeypatch.setattr(provider, "execute_query", spy_execute_query)
+    rows = [{"product_id": 1}, {"product_id": 3}, {"product_id": 4}]
+    config = {
+        "column": "product_id",
+        "provider": "db",
+        "query": "SELECT id AS product_id FROM products",
+    }
+
+    exact = TestFactory.create_test("references", config, rows, {"db": provider})
+    assert exact.run()["details"]["mode"] == "exact"
+    assert queries == []
+
+    config["max_exact_keys"] = 1
+    bloom = TestFactory.create_test("references", config, rows, {"db": provider})
+    result = bloom.run()
+
+    assert len(queries) == 1
+    assert result["details"]["mode"] == "bloom"
+    assert result["details"]["referenced_keys"] == 3
+    assert result["details"]["missing_keys"] == [{"key": {"product_id": 4}, "count": 1}]
@@ -0,0 +1,75 @@
+import time
+
+from aqueductus import runner
+from aqueductus.providers import SQLiteProvider
+
+# Counts up to a large number, slowed down by the progress handler below
+SLOW_QUERY = """
+WITH RECURSIVE counter(x) AS (
+    SELECT 1 UNION ALL SELECT x + 1 FROM counter WHERE x < 100000000
+)
+SELECT COUNT(*) AS total FROM counter
+"""
+
+
+def _slow_provider() -> SQLiteProvider:
+    provider = SQLiteProvider({"database_path": ":memory:"})
+    # Sleep every 1000 virtual machine instructions, returning None keeps it running
+    provider.conn.set_progress_handler(lambda: time.sleep(0.01), 1000)
+    return provider
+
+
+def test_query_timeout_cancels_query():
+    provider = _slow_provider()
+    test = runner.Test(
+        name="slow",
+        provider=provider,
+        query=SLOW_QUERY,
+        test_configs={"row_count": 1},
+        providers={},
+        timeout=0.2,
+    )
+
+    start_time = time.time()
+    test.run()
+
+    assert time.time() - start_time < 5
+    assert not test.passed
+    assert test.results[0]["name"] == "timeout"
+
+    # The connection is still usable after the cancellation
+    provider.conn.set_progress_handler(None, 0)
+    assert provider.execute_query("SELECT 1 AS one") == [{"one": 1}]
+
+
+def test_provider_timeout_is_used_by_default():
+    provider = _slow_provider()
+    provider.timeout = 0.2
+    test = runner.Test(
+        name="slow",
+        provider=provider,
+        query=SLOW_QUERY,
+        test_configs={"row_count": 1},
+        providers={},
+    )
+
+    test.run()
+
+    assert test.results[0]["name"] == "timeout"
+
+
+def test_query_within_timeout_passes():
+    provider = SQLiteProvider({"database_path": ":memory:"})
+    test = runner.Test(
+        name="fast",
+        provider=provider,
+        query="SELECT 1 AS one",
+        test_configs={"row_count": 1},
+        providers={},
+        timeout=5,
+    )
+
+    test.run()
+
+    assert test.passed
+    assert test.results[0]["name"] == "row_count"
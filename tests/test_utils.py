@@ -0,0 +1,33 @@
+import random
+
+from aqueductus import utils
+from aqueductus.utils import external_sort
+
+
+def test_external_sort_in_memory():
+    result = external_sort([3, 1, 2], key=lambda x: x, max_items_in_memory=10)
+
+    assert list(result) == [1, 2, 3]
+    assert list(external_sort([], key=lambda x: x, max_items_in_memory=10)) == []
+
+
+def test_external_sort_spills_and_merges(monkeypatch):
+    spilled_chunks = []
+    spill = utils._spill
+
+    def spy_spill(items):
+        spilled_chunks.append(len(items))
+        return spill(items)
+
+    monkeypatch.setattr(utils, "_spill", spy_spill)
+    # Several pickled blocks per spilled chunk
+    monkeypatch.setattr(utils, "_SPILL_BLOCK_SIZE", 300)
+    items = [(random.randint(0, 100), i) for i in range(2_500)]
+
+    result = list(
+        external_sort(items, key=lambda item: item[0], max_items_in_memory=1_000)
+    )
+
+    assert spilled_chunks == [1_000, 1_000, 500]
+    assert [key for key, _ in result] == sorted(key for key, _ in items)
+    assert sorted(result) == sorted(items)